@@ -0,0 +1,253 @@
+"""
+Times the export engine end to end on the pure-Python stand-in scene in
+lava.bench.standin, so it runs anywhere, without Maya: OBJ sequences (native,
+written behind, compressed and through the objExport stand-in), point
+caches, skin weights, cameras (sampled, and baked in the scene), skeletons,
+file name formatting and classifying a selection for the Exporter's type
+guess. For each case and mesh size it reports frames (or files, or names)
+per second, MB/s written and the peak memory Python allocated for one frame:
+
+	python -m lava.bench.export [--sizes 1000,100000] [--cases obj,skin-xml]
+
+The stand-in's scene reads cost about what the API's do per vertex, but it
+computes no deformation, so the numbers measure the exporters' own work.
+"""
+
+#=================================================
+# external imports
+#=================================================
+
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+try:
+	import tracemalloc
+except ImportError:
+	tracemalloc = None
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.bench import standin
+from lava.core.export.pointcache import EXT as POINT_CACHE_EXT
+
+#=================================================
+# constants
+#=================================================
+
+SIZES = (1000, 100000, 1000000)
+MESH_CASES = (
+	('obj', dict(write_threads=0)),
+	('obj-behind', dict(write_threads=2)),
+	('obj-gzip', dict(compression='gzip')),
+	('maya-obj', dict(native_obj=False)),
+	('point-cache', dict(point_cache=True, ext=POINT_CACHE_EXT)),
+	('skin-xml', dict(type='skin', ext='.xml', animation=False)),
+	('skin-binary', dict(type='skin', ext='.skw', animation=False)))
+CAMERA_CASES = (
+	('camera', dict()),
+	('camera-bake', dict(bake_cameras=True)))
+SKELETON_CASES = (
+	('joints', dict()),
+	('joints-world', dict(world_joints=True)))
+CASES = [name for name, kwargs in MESH_CASES + CAMERA_CASES + \
+	SKELETON_CASES] + ['naming', 'selection']
+VERTEX_FRAMES = 2000000  # Vertices times frames each mesh case samples.
+CAMERA_FRAMES = 1000
+CAMERAS = 20
+CHAINS, CHAIN_JOINTS = 10, 20
+NAMES = 100000
+SELECTED = 2000  # Meshes selected, half of them skinned.
+
+#=================================================
+# functions
+#=================================================
+
+def frame_count(size, budget=VERTEX_FRAMES):
+	return max(2, min(100, budget // size))
+
+def output_size(directory):
+	return sum(os.path.getsize(os.path.join(directory, f)) \
+		for f in os.listdir(directory))
+
+def measure(fn):
+	"""
+	Runs fn(directory) in a new temporary directory and returns the seconds
+	it took and the bytes it wrote there.
+	"""
+	directory = tempfile.mkdtemp(prefix='lava_bench_')
+	try:
+		start = time.time()
+		fn(directory)
+		return time.time() - start, output_size(directory)
+	finally:
+		shutil.rmtree(directory, ignore_errors=True)
+
+def peak_memory(fn):
+	"""
+	Returns the most memory Python had allocated at once while fn ran, in
+	bytes, or None where that can't be traced (Python 2).
+	"""
+	if tracemalloc is None:
+		return None
+	directory = tempfile.mkdtemp(prefix='lava_bench_')
+	tracemalloc.start()
+	try:
+		fn(directory)
+		return tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+		shutil.rmtree(directory, ignore_errors=True)
+
+def export(nodes, **kwargs):
+	"""
+	Runs an export of the stand-in nodes, selected first and with the file
+	name format fixed, the way the Exporter runs one.
+	"""
+	from lava.core.export.engine import ExportEngine
+	from lava.core.export.settings import ExportSettings
+	from lava.core.export.settings import fix_format
+	s = ExportSettings(**kwargs)
+	s.format = fix_format(s)
+	standin.select(nodes)
+	engine = ExportEngine(s)
+	engine.run(nodes)
+	return engine
+
+def mesh_case(size, frames, **kwargs):
+	"""
+	Returns a function that exports a new plane of a size over frames.
+	"""
+	def run(directory):
+		standin.scene.reset()
+		plane = standin.scene.plane(size)
+		if kwargs.get('type') == 'skin':
+			standin.scene.skin(plane)
+		settings = dict(type='mesh', path=directory, format='plane',
+			start=1.0, end=float(frames))
+		settings.update(kwargs)
+		export([plane], **settings)
+	return run
+
+def camera_case(frames, count=CAMERAS, **kwargs):
+	from lava.bench.standin import CAMERA_CHANNELS
+	from lava.bench.standin import TRANSFORM_CHANNELS
+	def run(directory):
+		standin.scene.reset()
+		cameras = [standin.scene.camera() for i in range(count)]
+		export(cameras, type='camera', path=directory, format='camera',
+			ext='.ma', start=1.0, end=float(frames), one_file=True,
+			create_stand_in=True, shape_attributes=list(CAMERA_CHANNELS),
+			transform_attributes=list(TRANSFORM_CHANNELS), **kwargs)
+	return run
+
+def skeleton_case(frames, chains=CHAINS, length=CHAIN_JOINTS, **kwargs):
+	"""
+	Returns a function that exports chains of joints over frames.
+	"""
+	def run(directory):
+		standin.scene.reset()
+		roots = [standin.scene.joints(length)[0] for i in range(chains)]
+		export(roots, type='skeleton', path=directory, format='skeleton',
+			ext='.lsk', start=1.0, end=float(frames), **kwargs)
+	return run
+
+def naming_case(count):
+	"""
+	Returns a function that fixes a name format and formats count frame
+	names with it, as a per-node sequence export does.
+	"""
+	from lava.core.export.settings import ExportSettings
+	from lava.core.export.settings import fix_format
+	from lava.core.export.settings import named_format
+	def run(directory):
+		s = ExportSettings(format='shot.%s', start=1.0, end=float(count),
+			one_file_per_node=True)
+		format = named_format(fix_format(s))
+		for frame, renum_frame in s.frames():
+			format % dict(name='plane1', frame=renum_frame)
+	return run
+
+def selection_case(count):
+	"""
+	Returns a function that classifies a selection of count small meshes,
+	half of them skinned, and as many cameras, as the Exporter does when it
+	opens. The scene is built up front, so only classifying is timed.
+	"""
+	from lava.core.export.selection import classify
+	standin.scene.reset()
+	nodes = [standin.scene.camera() for i in range(count)]
+	for i in range(count):
+		nodes.append(standin.scene.plane(4))
+		if i % 2:
+			standin.scene.skin(nodes[-1], 2)
+	standin.select(nodes)
+	def run(directory):
+		classify()
+	return run
+
+def report(out, case, size, count, seconds, size_written, peak):
+	rate = seconds and count / seconds or 0.0
+	mb = seconds and size_written / seconds / 1048576.0 or 0.0
+	out.write('%-12s %10s %8d %12.1f %10.2f %10s\n' % (case, size, count,
+		rate, mb, peak is None and '-' or '%.1f' % (peak / 1048576.0)))
+
+def run(sizes=SIZES, cases=CASES, budget=VERTEX_FRAMES, memory=True,
+	out=sys.stdout):
+	standin.install()
+	out.write('%-12s %10s %8s %12s %10s %10s\n' % ('case', 'vertices',
+		'frames', 'per second', 'MB/s', 'peak MB'))
+	kwargs, cameras = dict(MESH_CASES), dict(CAMERA_CASES)
+	skeletons = dict(SKELETON_CASES)
+	for case in cases:
+		if case in kwargs:
+			animated = kwargs[case].get('animation', True)
+			for size in sizes:
+				count = animated and frame_count(size, budget) or 1
+				seconds, written = measure(mesh_case(size, count,
+					**kwargs[case]))
+				peak = memory and peak_memory(mesh_case(size, 1,
+					**kwargs[case])) or None
+				report(out, case, size, count, seconds, written, peak)
+		elif case in cameras:
+			seconds, written = measure(camera_case(CAMERA_FRAMES,
+				**cameras[case]))
+			peak = memory and peak_memory(camera_case(CAMERA_FRAMES,
+				**cameras[case])) or None
+			report(out, case, '-', CAMERA_FRAMES, seconds, written, peak)
+		elif case in skeletons:
+			seconds, written = measure(skeleton_case(CAMERA_FRAMES,
+				**skeletons[case]))
+			peak = memory and peak_memory(skeleton_case(CAMERA_FRAMES,
+				**skeletons[case])) or None
+			report(out, case, '-', CAMERA_FRAMES, seconds, written, peak)
+		elif case == 'naming':
+			seconds, written = measure(naming_case(NAMES))
+			report(out, case, '-', NAMES, seconds, written, None)
+		elif case == 'selection':
+			seconds, written = measure(selection_case(SELECTED))
+			report(out, case, '-', 1, seconds, written, None)
+		else:
+			raise ValueError('Unknown case: %s. Use any of: %s.' % (case,
+				', '.join(CASES)))
+
+def main(args=None):
+	parser = optparse.OptionParser(usage='%prog [options]')
+	parser.add_option('--sizes', default=','.join(str(s) for s in SIZES),
+		help='comma-separated mesh vertex counts')
+	parser.add_option('--cases', default=','.join(CASES),
+		help='comma-separated cases, of: %s' % ', '.join(CASES))
+	parser.add_option('--budget', type='int', default=VERTEX_FRAMES,
+		help='vertices times frames each mesh case samples')
+	parser.add_option('--no-memory', dest='memory', action='store_false',
+		default=True, help="don't trace peak memory")
+	options, args = parser.parse_args(args)
+	run([int(s) for s in options.sizes.split(',')],
+		options.cases.split(','), options.budget, options.memory)
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,87 @@
+"""
+Times reading every point of a mesh three ways: PyMEL's per-vertex
+vtx.getPosition(), the API's MFnMesh.getPoints() into an MPointArray and
+PointBuffer, which read_points goes through, on planes of 1k to 1M
+vertices. Run it from Maya's script editor with run(), or under mayapy:
+
+	mayapy -m lava.bench.pointbuffer
+"""
+
+#=================================================
+# external imports
+#=================================================
+
+import sys
+import time
+
+#=================================================
+# constants
+#=================================================
+
+SIZES = (1000, 10000, 100000, 1000000)
+PYMEL_LIMIT = 100000  # Per-vertex PyMEL takes minutes past this.
+
+#=================================================
+# functions
+#=================================================
+
+def best_of(fn, repeat=3):
+	"""
+	Returns the fastest of repeat runs of fn, in seconds.
+	"""
+	best = None
+	for i in range(repeat):
+		start = time.time()
+		fn()
+		elapsed = time.time() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	return best
+
+def plane(vertex_count):
+	"""
+	Creates a plane with about vertex_count vertices and returns its shape.
+	"""
+	from pymel.core.modeling import polyPlane
+	side = max(1, int(round(vertex_count ** 0.5)) - 1)
+	return polyPlane(subdivisionsX=side, subdivisionsY=side,
+		constructionHistory=False)[0].getShape()
+
+def run(sizes=SIZES, repeat=3, pymel_limit=PYMEL_LIMIT, out=sys.stdout):
+	from maya import OpenMaya as om
+	from pymel.core.general import delete
+	from lava.core.export.nodes import mesh_path
+	from lava.util.pointbuffer import PointBuffer
+	from lava.util.pointbuffer import ZERO_COPY
+
+	world = om.MSpace.kWorld
+	out.write('Zero-copy views: %s\n' % (ZERO_COPY and 'yes' or 'no'))
+	out.write('%10s %12s %12s %12s %12s\n' % ('vertices', 'pymel ms',
+		'api ms', 'buffer ms', 'world ms'))
+	for size in sizes:
+		shape = plane(size)
+		try:
+			path = mesh_path(shape)
+			count = shape.numVertices()
+			if count <= pymel_limit:
+				pymel = '%12.2f' % (1000 * best_of(lambda: [v.getPosition( \
+					space='world') for v in shape.vtx], repeat))
+			else:
+				pymel = '%12s' % '-'
+			api = 1000 * best_of(lambda: om.MFnMesh(path).getPoints(
+				om.MPointArray(), world), repeat)
+			raw = 1000 * best_of(lambda: PointBuffer(path).points(), repeat)
+			moved = 1000 * best_of(lambda: PointBuffer(path).points(world),
+				repeat)
+			out.write('%10d %s %12.2f %12.2f %12.2f\n' % (count, pymel, api,
+				raw, moved))
+		finally:
+			delete(shape.getParent())
+
+def main():
+	import maya.standalone
+	maya.standalone.initialize(name='python')
+	run()
+
+if __name__ == '__main__':
+	main()
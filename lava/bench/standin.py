@@ -0,0 +1,981 @@
+"""
+A pure-Python stand-in for the few maya and pymel calls the exporters make,
+over an in-memory scene of plane meshes, cameras, joints and skin clusters,
+so the export engine can be run and timed without Maya. install() puts it in
+sys.modules in place of the real modules, which mustn't have been imported.
+Only what the exporters use is modelled; anything else the modules are
+asked for is a stub that accepts any arguments and does nothing.
+
+Animated values are plain functions of time, and a mesh's points are its
+rest positions moved by an offset that changes every frame, so sampling
+costs the same per vertex as reading a real mesh through the API, without
+any deformation being computed.
+"""
+
+#=================================================
+# external imports
+#=================================================
+
+import math
+import os
+import sys
+import types
+from array import array
+
+#=================================================
+# constants
+#=================================================
+
+MODULES = ('maya', 'maya.cmds', 'maya.OpenMaya', 'maya.OpenMayaAnim',
+	'maya.standalone', 'pymel', 'pymel.core', 'pymel.core.animation',
+	'pymel.core.general', 'pymel.core.language', 'pymel.core.modeling',
+	'pymel.core.nodetypes', 'pymel.core.system', 'pymel.internal',
+	'pymel.internal.factories')
+TRANSFORM_CHANNELS = ('tx', 'ty', 'tz', 'rx', 'ry', 'rz')
+CAMERA_CHANNELS = ('focalLength', 'horizontalFilmAperture',
+	'verticalFilmAperture', 'focusDistance')
+# Node types that live in the DAG, as type='dagNode' matches them.
+DAG_TYPES = ('transform', 'joint', 'mesh', 'camera', 'parentConstraint')
+DEFAULTS = dict(sx=1.0, sy=1.0, sz=1.0, focalLength=35.0,
+	horizontalFilmAperture=1.417, verticalFilmAperture=0.945,
+	focusDistance=5.0, normalizeWeights=1, rotateOrder=0)
+
+#=================================================
+# classes
+#=================================================
+
+class _Module(types.ModuleType):
+	"""
+	A stand-in module: any public name it doesn't define is a stub.
+	"""
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		stub = type(name, (_Stub,), {})
+		setattr(self, name, stub)
+		return stub
+
+class _Stub(object):
+	"""
+	Accepts any arguments and does nothing, as a function or a base class.
+	"""
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		return _Stub
+
+class Scene(object):
+	"""
+	Every node of the stand-in scene, by name, with the current time and
+	selection.
+	"""
+
+	def __init__(self):
+		self.reset()
+
+	def reset(self):
+		self.nodes, self.order, self.counters = {}, [], {}
+		self.time, self.selection = 1.0, []
+
+	def add(self, node):
+		name = node._name
+		if name in self.nodes:
+			base = name.rstrip('0123456789')
+			i = self.counters.get(base, 1)
+			while name in self.nodes:
+				name, i = '%s%d' % (base, i), i + 1
+			self.counters[base] = i
+		node._name = name
+		self.nodes[name] = node
+		self.order.append(node)
+		return node
+
+	def remove(self, nodes):
+		"""
+		Removes nodes and their descendants, all at once.
+		"""
+		doomed = set()
+		for node in nodes:
+			if self.nodes.get(node._name) is node:
+				doomed.update(id(d) for d in node.descendants())
+				if node.parent is not None:
+					node.parent.children.remove(node)
+		for node in self.order:
+			if id(node) in doomed:
+				del self.nodes[node._name]
+		self.order = [n for n in self.order if id(n) not in doomed]
+		self.selection = [n for n in self.selection if id(n) not in doomed]
+
+	def find(self, name):
+		"""
+		Returns a node by name, long name or node, or None.
+		"""
+		if isinstance(name, Node):
+			return name
+		name = str(name)
+		if name.startswith('|'):
+			name = name.rsplit('|', 1)[1]
+		return self.nodes.get(name.split('.', 1)[0])
+
+	def get(self, name):
+		node = self.find(name)
+		if node is None:
+			raise RuntimeError('No object matches name: %s' % name)
+		return node
+
+	def plane(self, vertex_count, name='plane1'):
+		"""
+		Adds a square plane mesh of about vertex_count vertices under an
+		animated transform, and returns the transform.
+		"""
+		transform = Transform(name=name)
+		animate(transform, TRANSFORM_CHANNELS[:3], 0.0)
+		Mesh(transform, vertex_count)
+		return transform
+
+	def camera(self, name='camera1'):
+		transform = Transform(name=name)
+		animate(transform, TRANSFORM_CHANNELS, 1.0)
+		shape = Node(transform.name() + 'Shape', transform)
+		shape.type = 'camera'
+		animate(shape, CAMERA_CHANNELS, 2.0)
+		return transform
+
+	def joints(self, count, name='joint1'):
+		"""
+		Adds an animated chain of joints and returns them, root first.
+		"""
+		joints, parent = [], None
+		for i in range(count):
+			joint = Node(name, parent)
+			joint.type = 'joint'
+			animate(joint, TRANSFORM_CHANNELS, 3.0 + i)
+			joint.values['tx'] = 1.0
+			joints.append(joint)
+			parent = joint
+		return joints
+
+	def skin(self, transform, influences=4):
+		"""
+		Binds a mesh to a new chain of joints, each vertex weighted between
+		two neighbouring influences, and returns the skin cluster.
+		"""
+		mesh = transform.getShape()
+		joints = self.joints(influences)
+		count = mesh.numVertices()
+		weights = array('d', [0.0]) * (count * influences)
+		for i in range(count):
+			j = i % influences
+			weights[i * influences + j] = 0.75
+			weights[i * influences + (j + 1) % influences] += 0.25
+		cluster = Node('skinCluster1')
+		cluster.type = 'skinCluster'
+		cluster.mesh, cluster.influences = mesh, joints
+		cluster.weights = weights
+		mesh.skin_cluster = cluster
+		mesh.sources.append(cluster)
+		return cluster
+
+class Node(object):
+	"""
+	A stand-in node and its PyMEL interface. Attribute values are constants
+	or, once animated or baked, functions of time. Sources are the nodes
+	connected into it.
+	"""
+
+	type = 'transform'
+
+	def __init__(self, name='transform1', parent=None, **kwargs):
+		self._name = name
+		self.parent, self.children = None, []
+		self.values, self.curves, self.keys = dict(DEFAULTS), {}, {}
+		self.sources = []
+		scene.add(self)
+		if parent is not None:
+			self.setParent(parent)
+
+	def __repr__(self):
+		return '%s(%r)' % (self.__class__.__name__, self._name)
+
+	def __str__(self):
+		return self._name
+
+	def name(self):
+		return self._name
+
+	shortName = nodeName = partialPathName = name
+
+	def longName(self):
+		names, node = [], self
+		while node is not None:
+			names.append(node._name)
+			node = node.parent
+		return '|' + '|'.join(reversed(names))
+
+	fullPathName = longName
+
+	def getParent(self):
+		return self.parent
+
+	firstParent2 = getParent
+
+	def setParent(self, parent=None, world=False):
+		if self.parent is not None:
+			self.parent.children.remove(self)
+		self.parent = not world and parent or None
+		if self.parent is not None:
+			self.parent.children.append(self)
+
+	def getShape(self):
+		for child in self.children:
+			if child.type not in ('transform', 'joint'):
+				return child
+
+	def descendants(self):
+		result = [self]
+		for child in self.children:
+			result += child.descendants()
+		return result
+
+	def attr(self, name):
+		return Attribute(self, name)
+
+	def value(self, name, time=None):
+		curve = self.curves.get(name)
+		if curve is None:
+			return self.values.get(name, 0.0)
+		if time is None:
+			time = scene.time
+		return curve(time)
+
+	def translation(self, time=None):
+		"""
+		Returns the world translation at a time: the stand-in's transforms
+		only ever translate.
+		"""
+		x = y = z = 0.0
+		node = self
+		while node is not None:
+			x += node.value('tx', time)
+			y += node.value('ty', time)
+			z += node.value('tz', time)
+			node = node.parent
+		return x, y, z
+
+class Transform(Node):
+	pass
+
+class Mesh(Node):
+	"""
+	A square plane of side x side vertices, a quad per cell, with a UV and a
+	normal per vertex.
+	"""
+
+	type = 'mesh'
+	skin_cluster = None
+
+	def __init__(self, parent, vertex_count, **kwargs):
+		Node.__init__(self, parent.name() + 'Shape', parent)
+		self.side = side = max(2, int(round(vertex_count ** 0.5)))
+		self.rest = array('d', [0.0]) * (side * side * 3)
+		self.rest[0::3] = array('d', [float(i % side) for i in \
+			range(side * side)])
+		self.rest[2::3] = array('d', [float(i // side) for i in \
+			range(side * side)])
+		self.normals = array('f', [0.0, 1.0, 0.0]) * (side * side)
+		self._topology = None
+
+	def numVertices(self):
+		return self.side * self.side
+
+	def points(self, time=None, world=False):
+		"""
+		Returns the points at a time as flat coordinates and the offset every
+		point is moved by.
+		"""
+		if time is None:
+			time = scene.time
+		x, y, z = world and self.parent.translation(time) or (0.0, 0.0, 0.0)
+		return self.rest, (x, y + math.sin(time * 0.1), z)
+
+	def topology(self):
+		"""
+		Returns the face vertex counts and vertex ids, built on first use.
+		"""
+		if self._topology is None:
+			side = self.side
+			counts = array('i', [4]) * ((side - 1) * (side - 1))
+			connects = array('i')
+			for row in range(side - 1):
+				for column in range(side - 1):
+					i = row * side + column
+					connects.extend((i, i + 1, i + side + 1, i + side))
+			self._topology = counts, connects
+		return self._topology
+
+class Attribute(object):
+
+	def __init__(self, node, name):
+		self.node, self.attr = node, name
+
+	def __str__(self):
+		return '%s.%s' % (self.node, self.attr)
+
+	def get(self, time=None):
+		return self.node.value(self.attr, time)
+
+	def set(self, *args, **kwargs):
+		if args and isinstance(args[0], (int, float)):
+			self.node.values[self.attr] = args[0]
+			self.node.curves.pop(self.attr, None)
+
+class Path(str):
+	"""
+	The part of PyMEL's Path the exporters use.
+	"""
+
+	def __div__(self, other):
+		return Path(os.path.join(self, other))
+
+	__truediv__ = __div__
+
+	def __add__(self, other):
+		return Path(str.__add__(self, other))
+
+	def exists(self):
+		return os.path.exists(self)
+
+	def getsize(self):
+		return os.path.getsize(self)
+
+class Mel(object):
+	"""
+	The MEL procedures the exporters call, and stubs for any others.
+	"""
+
+	def findRelatedSkinCluster(self, mesh):
+		node = scene.find(mesh)
+		for n in node and node.descendants() or ():
+			if getattr(n, 'skin_cluster', None) is not None:
+				return n.skin_cluster.name()
+		return ''
+
+	def currentTimeUnitToFPS(self):
+		return 24.0
+
+	def __getattr__(self, name):
+		if name.startswith('__'):
+			raise AttributeError(name)
+		return _Stub
+
+# OpenMaya
+
+class MSpace(object):
+	kInvalid, kTransform, kPreTransform, kPostTransform, kWorld, kObject = \
+		range(6)
+
+class MFn(object):
+	kMeshVertComponent = 550
+
+class MGlobal(object):
+	messages = []
+
+	@staticmethod
+	def displayInfo(msg):
+		MGlobal.messages.append(msg)
+
+	displayWarning = displayError = displayInfo
+
+class MTime(object):
+
+	def __init__(self, value=0.0, unit=None):
+		self._value = value
+
+	def value(self):
+		return self._value
+
+	@staticmethod
+	def uiUnit():
+		return 'film'
+
+class MDGContext(object):
+
+	def __init__(self, time=None):
+		self.time = time is not None and time.value() or None
+
+class MObject(object):
+
+	def __init__(self, node=None, time=None, world=False):
+		self.node, self.time, self.world = node, time, world
+
+	def isNull(self):
+		return self.node is None
+
+class MDagPath(object):
+
+	def __init__(self, node=None):
+		self.dag_node = node
+
+	def node(self):
+		return MObject(self.dag_node)
+
+	def fullPathName(self):
+		return self.dag_node.longName()
+
+	def partialPathName(self):
+		return self.dag_node.name()
+
+	def instanceNumber(self):
+		return 0
+
+	def inclusiveMatrix(self):
+		return MMatrix(self.dag_node.translation())
+
+class MMatrix(object):
+	"""
+	A world translation and, left out of its elements, the node's own
+	rotation.
+	"""
+
+	def __init__(self, translation=(0.0, 0.0, 0.0), rotation=(0.0, 0.0, 0.0)):
+		self.translation, self.rotation = translation, rotation
+
+	def __call__(self, row, column):
+		if row == 3 and column < 3:
+			return self.translation[column]
+		return row == column and 1.0 or 0.0
+
+class MSelectionList(object):
+
+	def __init__(self):
+		self.items = []
+
+	def add(self, name):
+		self.items.append(scene.get(name))
+
+	def length(self):
+		return len(self.items)
+
+	def getDagPath(self, i, path):
+		path.dag_node = self.items[i]
+
+	def getDependNode(self, i, obj):
+		obj.node = self.items[i]
+
+class MVector(object):
+
+	def __init__(self, x=0.0, y=0.0, z=0.0):
+		self.x, self.y, self.z = x, y, z
+
+class MEulerRotation(MVector):
+
+	def __init__(self, x=0.0, y=0.0, z=0.0, order=0):
+		MVector.__init__(self, x, y, z)
+		self.order = order
+
+	def reorderIt(self, order):
+		self.order = order
+		return self
+
+	def setToClosestSolution(self, other):
+		return self
+
+class MTransformationMatrix(object):
+
+	def __init__(self, matrix=None):
+		self.matrix = matrix or MMatrix()
+
+	def getTranslation(self, space=None):
+		return MVector(*self.matrix.translation)
+
+	def eulerRotation(self):
+		return MEulerRotation(*self.matrix.rotation)
+
+	def rotation(self):
+		"""
+		Returns the xyz Euler rotation as a quaternion.
+		"""
+		(cx, cy, cz), (sx, sy, sz) = [[f(a / 2.0) for a in \
+			self.matrix.rotation] for f in (math.cos, math.sin)]
+		return MQuaternion(sx * cy * cz - cx * sy * sz,
+			cx * sy * cz + sx * cy * sz, cx * cy * sz - sx * sy * cz,
+			cx * cy * cz + sx * sy * sz)
+
+class MQuaternion(object):
+
+	def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+		self.x, self.y, self.z, self.w = x, y, z, w
+
+class MFnMatrixData(object):
+
+	def __init__(self, obj=None):
+		self.obj = obj
+
+	def matrix(self):
+		node, time = self.obj.node, self.obj.time
+		if self.obj.world:
+			translation = node.translation(time)
+		else:
+			translation = tuple(node.value(a, time) for a in ('tx', 'ty', 'tz'))
+		return MMatrix(translation, tuple(node.value(a, time) \
+			for a in ('rx', 'ry', 'rz')))
+
+class MPoint(object):
+	__slots__ = ('x', 'y', 'z', 'w')
+
+	def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+		self.x, self.y, self.z, self.w = x, y, z, w
+
+class MFloatVector(object):
+	__slots__ = ('x', 'y', 'z')
+
+	def __init__(self, x=0.0, y=0.0, z=0.0):
+		self.x, self.y, self.z = x, y, z
+
+class _Array(object):
+	"""
+	An API array over a flat Python array.
+	"""
+
+	typecode = 'd'
+
+	def __init__(self, count=0, value=0):
+		self.data = array(self.typecode, [value]) * count
+
+	def length(self):
+		return len(self.data)
+
+	def __len__(self):
+		return len(self.data)
+
+	def __getitem__(self, i):
+		return self.data[i]
+
+	def __setitem__(self, i, value):
+		self.data[i] = value
+
+	def append(self, value):
+		self.data.append(value)
+
+	def set(self, value, i):
+		self.data[i] = value
+
+	def setLength(self, count):
+		del self.data[count:]
+		self.data.extend(array(self.typecode, [0]) * (count - len(self.data)))
+
+class MIntArray(_Array):
+	typecode = 'i'
+
+class MFloatArray(_Array):
+	typecode = 'f'
+
+class MDoubleArray(_Array):
+	typecode = 'd'
+
+class MPointArray(object):
+	"""
+	Flat coordinates moved by an offset, handed out as an MPoint per item.
+	"""
+
+	def __init__(self):
+		self.coords, self.offset = array('d'), (0.0, 0.0, 0.0)
+
+	def length(self):
+		return len(self.coords) // 3
+
+	def __getitem__(self, i):
+		c, (x, y, z) = self.coords, self.offset
+		i *= 3
+		return MPoint(c[i] + x, c[i + 1] + y, c[i + 2] + z)
+
+class MFloatVectorArray(object):
+
+	def __init__(self):
+		self.coords = array('f')
+
+	def length(self):
+		return len(self.coords) // 3
+
+	def __getitem__(self, i):
+		c = self.coords
+		i *= 3
+		return MFloatVector(c[i], c[i + 1], c[i + 2])
+
+class MDagPathArray(object):
+
+	def __init__(self):
+		self.paths = []
+
+	def length(self):
+		return len(self.paths)
+
+	def __getitem__(self, i):
+		return self.paths[i]
+
+class MPlug(object):
+
+	def __init__(self, node, attr):
+		self.node, self.attr = node, attr
+
+	def elementByLogicalIndex(self, i):
+		return self
+
+	def asMObject(self, context=None):
+		return MObject(self.node, context and context.time,
+			self.attr in ('worldMesh', 'worldMatrix'))
+
+	def asDouble(self, context=None):
+		return float(self.node.value(self.attr, context and context.time))
+
+	def asShort(self, context=None):
+		return int(self.asDouble(context))
+
+class MFnDependencyNode(object):
+
+	def __init__(self, obj=None):
+		self.obj = obj
+
+	def name(self):
+		return self.obj.node.name()
+
+	def findPlug(self, attr, want_networked=False):
+		return MPlug(self.obj.node, attr)
+
+class MFnDagNode(MFnDependencyNode):
+
+	def __init__(self, path=None):
+		node = isinstance(path, MDagPath) and path.dag_node or path.node
+		MFnDependencyNode.__init__(self, MObject(node))
+
+	def parent(self, i=0):
+		return MObject(self.obj.node.parent)
+
+class MFnMesh(object):
+	"""
+	A mesh function set over a DAG path, which reads the mesh at the current
+	time in either space, or over mesh data, evaluated at a time in the
+	space of the plug it came from.
+	"""
+
+	def __init__(self, obj=None):
+		if isinstance(obj, MDagPath):
+			self.mesh, self.time, self.world = obj.dag_node, None, None
+		else:
+			self.mesh, self.time, self.world = obj.node, obj.time, obj.world
+		if self.mesh.type == 'transform':
+			self.mesh = self.mesh.getShape()
+
+	def numVertices(self):
+		return self.mesh.numVertices()
+
+	numNormals = numUVs = numVertices
+
+	def numPolygons(self):
+		return len(self.mesh.topology()[0])
+
+	def getPoints(self, points, space=MSpace.kObject):
+		world = self.world
+		if world is None:
+			world = space == MSpace.kWorld
+		points.coords, points.offset = self.mesh.points(self.time, world)
+
+	def getNormals(self, normals, space=MSpace.kObject):
+		normals.coords = self.mesh.normals
+
+	def getVertices(self, counts, connects):
+		counts.data, connects.data = self.mesh.topology()
+
+	def getUVs(self, u, v, uv_set=None):
+		rest, side = self.mesh.rest, float(self.mesh.side - 1)
+		u.data = array('f', [x / side for x in rest[0::3]])
+		v.data = array('f', [z / side for z in rest[2::3]])
+
+	getAssignedUVs = getNormalIds = getVertices
+
+class MFnSingleIndexedComponent(object):
+
+	def create(self, type):
+		self.count = 0
+		return MObject()
+
+	def setCompleteData(self, count):
+		self.count = count
+
+class MScriptUtil(object):
+
+	def createFromInt(self, value):
+		self.value = [value]
+
+	def asUintPtr(self):
+		return self.value
+
+	asIntPtr = asUintPtr
+
+	@staticmethod
+	def getUint(ptr):
+		return ptr[0]
+
+	getInt = getUint
+
+# OpenMayaAnim
+
+class MFnSkinCluster(MFnDependencyNode):
+
+	def influenceObjects(self, paths):
+		paths.paths = [MDagPath(j) for j in self.obj.node.influences]
+		return len(paths.paths)
+
+	def getWeights(self, path, components, weights, count_ptr):
+		cluster = self.obj.node
+		weights.data = array('d', cluster.weights)
+		count_ptr[0] = len(cluster.influences)
+
+#=================================================
+# functions
+#=================================================
+
+def animate(node, channels, phase):
+	"""
+	Gives a node's channels smooth, distinct curves.
+	"""
+	for i, channel in enumerate(channels):
+		base = node.values.get(channel, 0.0)
+		node.curves[channel] = (lambda base, p: lambda t: \
+			base + math.sin(t * 0.05 + p))(base, phase + i)
+
+def _nodes(args):
+	result = []
+	for arg in args:
+		if hasattr(arg, '__iter__') and not isinstance(arg, (str, Node)):
+			result += _nodes(arg)
+		elif arg is not None:
+			result.append(scene.get(arg))
+	return result
+
+def ls(*args, **kwargs):
+	if kwargs.get('undeletable', kwargs.get('ud')):
+		return []
+	if kwargs.get('selection', kwargs.get('sl')):
+		nodes = list(scene.selection)
+	elif args:
+		nodes = _nodes(args)
+	else:
+		nodes = list(scene.order)
+	if kwargs.get('dagObjects', kwargs.get('dag')):
+		nodes = [d for n in nodes for d in n.descendants()]
+	type = kwargs.get('type')
+	if kwargs.get('cameras'):
+		type = 'camera'
+	if type:
+		types = isinstance(type, str) and [type] or list(type)
+		if 'dagNode' in types:
+			types += DAG_TYPES
+		nodes = [n for n in nodes if n.type in types]
+	if kwargs.get('shapes', kwargs.get('s')):
+		nodes = [n for n in nodes if n.type in DAG_TYPES and \
+			n.type not in ('transform', 'joint')]
+	result, seen = [], set()
+	for n in nodes:
+		if id(n) not in seen:
+			seen.add(id(n))
+			result.append(n)
+	return result
+
+def ls_names(*args, **kwargs):
+	"""
+	The maya.cmds ls, which returns names.
+	"""
+	long = kwargs.pop('long', kwargs.pop('l', False))
+	show_type = kwargs.pop('showType', kwargs.pop('st', False))
+	result = []
+	for n in ls(*args, **kwargs):
+		result.append(long and n.longName() or n.name())
+		if show_type:
+			result.append(n.type)
+	return result
+
+def list_connections(*args, **kwargs):
+	"""
+	The maya.cmds listConnections, of incoming or outgoing connections.
+	"""
+	nodes = _nodes(args)
+	if kwargs.get('destination', kwargs.get('d', True)) and \
+		not kwargs.get('source', kwargs.get('s', True)):
+		ids = set(id(n) for n in nodes)
+		return [d.name() for d in scene.order \
+			if [s for s in d.sources if id(s) in ids]]
+	return [s.name() for n in nodes for s in n.sources]
+
+def list_relatives(*args, **kwargs):
+	"""
+	The maya.cmds listRelatives, of all descendants only.
+	"""
+	return [d.longName() for n in _nodes(args) for d in n.descendants()[1:]]
+
+def select(*args, **kwargs):
+	nodes = _nodes(args)
+	if kwargs.get('add'):
+		scene.selection += [n for n in nodes if n not in scene.selection]
+	else:
+		scene.selection = nodes
+
+def selected(**kwargs):
+	return list(scene.selection)
+
+def delete(*args, **kwargs):
+	scene.remove(_nodes(args))
+
+def set_current_time(frame, **kwargs):
+	scene.time = float(frame)
+
+def current_time(*args, **kwargs):
+	if args:
+		scene.time = float(args[0])
+	return scene.time
+
+def bake_results(*args, **kwargs):
+	"""
+	Keys every attribute on every frame of the range from its current value,
+	replacing what drove it.
+	"""
+	time = kwargs.get('time', kwargs.get('t', (scene.time,)))
+	start, end = time[0], time[-1]
+	frames = [float(f) for f in range(int(start), int(end) + 1)]
+	nodes = _nodes(args)
+	for node in nodes[:]:
+		if kwargs.get('shape') and node.getShape() is not None:
+			nodes.append(node.getShape())
+	for node in nodes:
+		if kwargs.get('disableImplicitControl'):
+			node.sources = []
+		for attr in kwargs.get('attribute', kwargs.get('at', ())):
+			keys = dict((f, node.value(attr, f)) for f in frames)
+			node.keys[attr] = keys
+			node.curves[attr] = (lambda keys: lambda t: keys[t] if t in keys \
+				else keys[min(keys, key=lambda k: abs(k - t))])(keys)
+
+def parent_constraint(*args, **kwargs):
+	"""
+	Drives the last node's translation and rotation from the others'.
+	"""
+	nodes = _nodes(args)
+	drivers, driven = nodes[:-1], nodes[-1]
+	for channel in TRANSFORM_CHANNELS:
+		driven.curves[channel] = (lambda driver, c: lambda t: \
+			driver.value(c, t))(drivers[0], channel)
+	constraint = Node(kwargs.get('name', 'parentConstraint1'), driven)
+	constraint.type = 'parentConstraint'
+	constraint.sources = drivers
+	driven.sources.append(constraint)
+	return constraint
+
+def export_selected(path, **kwargs):
+	"""
+	Writes the keys of the selected nodes and their shapes, a line per
+	attribute, like a much simplified Maya ASCII file.
+	"""
+	with open(path, 'w') as f:
+		f.write('//Maya ASCII stand-in\n')
+		for node in ls(selection=True, dagObjects=True):
+			f.write('createNode %s -n "%s";\n' % (node.type, node.name()))
+			for attr, keys in sorted(node.keys.items()):
+				f.write('\tsetAttr ".%s" -type "keys" %s;\n' % (attr,
+					' '.join('%g %g' % (k, keys[k]) for k in sorted(keys))))
+	return path
+
+def file(*args, **kwargs):
+	"""
+	Exports the selected meshes as OBJ, the way objExport would, reading
+	every point through the API one at a time.
+	"""
+	if not kwargs.get('exportSelected', kwargs.get('es')):
+		return None
+	with open(args[0], 'w') as f:
+		for node in ls(selection=True, dagObjects=True, type='mesh'):
+			points = MPointArray()
+			MFnMesh(MDagPath(node)).getPoints(points, MSpace.kWorld)
+			f.write('g %s\n' % node.parent.name())
+			for i in range(points.length()):
+				p = points[i]
+				f.write('v %f %f %f\n' % (p.x, p.y, p.z))
+	return args[0]
+
+def get_attr(name, **kwargs):
+	node, attr = str(name).split('.', 1)
+	return scene.get(node).value(attr)
+
+def set_attr(name, *args, **kwargs):
+	node, attr = str(name).split('.', 1)
+	scene.get(node).attr(attr).set(*args)
+
+def connection_info(*args, **kwargs):
+	return False
+
+def plugin_info(*args, **kwargs):
+	return True
+
+def nothing(*args, **kwargs):
+	pass
+
+def _module(name, **attributes):
+	module = _Module(name)
+	module.__dict__.update(attributes)
+	return module
+
+def install():
+	"""
+	Puts the stand-in in sys.modules in place of maya and pymel, and returns
+	its scene.
+	"""
+	for name in MODULES:
+		if name in sys.modules and not isinstance(sys.modules[name], _Module):
+			raise RuntimeError('%s was already imported.' % name)
+	if 'maya' in sys.modules:
+		return scene
+	this = sys.modules[__name__]
+	om = _module('maya.OpenMaya')
+	for name, value in list(this.__dict__.items()):
+		if name[:1] == 'M' and name[1:2].isupper() and isinstance(value, type):
+			setattr(om, name, value)
+	oma = _module('maya.OpenMayaAnim', MFnSkinCluster=MFnSkinCluster)
+	cmds = _module('maya.cmds', ls=ls_names, select=select, delete=delete,
+		currentTime=current_time, refresh=nothing, file=file,
+		listConnections=list_connections, listRelatives=list_relatives,
+		getAttr=get_attr, setAttr=set_attr, skinPercent=nothing)
+	nodetypes = _module('pymel.core.nodetypes', Transform=Transform,
+		Joint=Node, Mesh=Mesh, Camera=Node)
+	general = _module('pymel.core.general', ls=ls, select=select,
+		selected=selected, delete=delete, connectionInfo=connection_info,
+		cycleCheck=nothing, disconnectAttr=nothing)
+	animation = _module('pymel.core.animation', bakeResults=bake_results,
+		parentConstraint=parent_constraint, setCurrentTime=set_current_time,
+		currentTime=current_time)
+	language = _module('pymel.core.language', mel=Mel())
+	system = _module('pymel.core.system', Path=Path,
+		exportSelected=export_selected, loadPlugin=nothing,
+		pluginInfo=plugin_info, undoInfo=nothing)
+	factories = _module('pymel.internal.factories', apiUndo=[])
+	modules = dict(cmds=cmds, OpenMaya=om, OpenMayaAnim=oma,
+		nodetypes=nodetypes, general=general, animation=animation,
+		language=language, system=system, factories=factories)
+	for name in MODULES:
+		module = modules.get(name.rsplit('.', 1)[-1]) or _module(name)
+		if name in ('maya', 'pymel', 'pymel.core', 'pymel.internal'):
+			module.__path__ = []
+		sys.modules[name] = module
+		if '.' in name:
+			parent, child = name.rsplit('.', 1)
+			setattr(sys.modules[parent], child, module)
+	return scene
+
+#=================================================
+# the scene
+#=================================================
+
+scene = Scene()
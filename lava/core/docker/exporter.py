@@ -1,63 +1,58 @@
 import os
-import re
 import sys
 
-from maya import cmds as mc
-from pymel.core.animation import bakeResults
-from pymel.core.animation import parentConstraint
 from pymel.core.animation import playbackOptions
-from pymel.core.animation import setCurrentTime
-from pymel.core.animation import skinPercent
-from pymel.core.general import connectionInfo
-from pymel.core.general import cycleCheck
-from pymel.core.general import delete
-from pymel.core.general import disconnectAttr
-from pymel.core.general import listRelatives
 from pymel.core.general import ls
-from pymel.core.general import select
 from pymel.core.general import selected
 from pymel.core.language import mel
-from pymel.core.modeling import polyEvaluate
-from pymel.core.nodetypes import SkinCluster
-from pymel.core.nodetypes import Transform
 from pymel.core.runtime import ExportOptions
 from pymel.core.runtime import ExportSelectionOptions
-from pymel.core.system import exportAll
-from pymel.core.system import exportSelected
 from pymel.core.system import fileDialog2
-from pymel.core.system import loadPlugin
 from pymel.core.system import Path
-from pymel.core.system import pluginInfo
 from pymel.core.system import showHelp
 from pymel.core.system import workspace
 from pymel.core.windows import confirmDialog
 from pymel.core.windows import getMainProgressBar
 from PyQt4.QtCore import pyqtSlot
-from PyQt4.QtCore import QString
 from PyQt4.QtGui import QCheckBox
-from xml.dom import minidom
-from xml.etree.ElementTree import Comment
-from xml.etree.ElementTree import Element
-from xml.etree.ElementTree import ElementTree
-from xml.etree.ElementTree import SubElement
-from xml.etree.ElementTree import tostring
 
+from lava.core.export.engine import ExportEngine
+from lava.core.export.engine import ExportError
+from lava.core.export.engine import FormatError
+from lava.core.export.engine import Reporter
+from lava.core.export.pointcache import EXT as POINT_CACHE_EXT
+from lava.core.export.selection import classify
+from lava.core.export.settings import ExportSettings
+from lava.core.export.settings import EXTENSIONS
+from lava.core.export.settings import fix_format
+from lava.core.export.settings import HELD_FRAMES
+from lava.core.export.settings import NODE_NAMES
+from lava.core.export.settings import TYPES
+from lava.core.export.skinweights import apply_skin_weight_batches
+from lava.core.export.skinweights import apply_skin_weights
+from lava.core.export.skinweights import FORMATS as SKIN_FORMATS
+from lava.core.export.skinweights import iter_xml
+from lava.core.export.skinweights import load_skin_weights
+from lava.core.export.skinweights import read_binary
+from lava.core.export.skinweights import read_positions
+from lava.core.export.skinweights import transfer_by_position
 from lava.core.general import error
-from lava.core.general import info
 from lava.core.general import result
 from lava.core.ui.base import UIDocker
+from lava.core.ui.progress import ProgressReporter
+from lava.util.compression import CODECS
+from lava.util.compression import DEFAULT_LEVELS
+from lava.util.compression import LEVELS
 
 
 class Exporter(UIDocker):
 	"""
-	Exports individual files per frame and names them appropriately.
+	Exports individual files per frame and names them appropriately. The
+	export itself runs in lava.core.export.engine, which doesn't need a UI.
 	"""
 	
 	def __init__(self, *args, **kwargs):
 		super(Exporter, self).__init__(*args, **kwargs)
-		self.name_pat = re.compile('(%s)')
-		self.frame_pat = re.compile('(%[\d\.]*(?:f|d))')
-		self.split_pat = re.compile('((?:%s|%[\d\.]*(?:d|f)))')
 		self.run_showers = (self.progress, self.status)
 		self.run_disablers = (self.reload, self.toolBox, self.exportOptions,
 			self.exportButton)
@@ -67,26 +62,17 @@ class Exporter(UIDocker):
 			self.animation_widgets += ((self.toolBox.widget(i),
 				self.toolBox.itemText(i)),)
 		self.main_progress = getMainProgressBar()
-		self._aborted = False
+		if 'zstd' not in CODECS:
+			self.compression.removeItem(self.compression.findText('zstd'))
 		
 		# Look at the selection to predict what kind of object the user is going
-		# to export and auto-select it in the export type combo box.
-		kwargs = dict(selection=True, dagObjects=True)
-		jroots = len(dict(((j, None) for j in ls(type='joint', **kwargs))).keys())
-		cams = len(ls(cameras=True, **kwargs))
-		meshes, skins = ls(geometry=True, **kwargs), 0
-		del_meshes = []
-		for i, m in enumerate(meshes):
-			if mel.findRelatedSkinCluster(m):
-				skins += 1
-				del_meshes.append(i)
-		for i in del_meshes:
-			del meshes[i]
-		if not jroots and not cams and not meshes and not skins:
+		# to export and auto-select it in the export type combo box: the kind
+		# there's most of, the later one on a tie.
+		counts = classify()
+		if not any(counts):
 			comboIndex = 2  # Meshes as default
 		else:
-			comboIndex = sorted(((i, c) for i, c in enumerate( \
-				(jroots, cams, meshes, skins))), key=lambda x: x[1])[-1][0]
+			comboIndex = max(range(len(counts)), key=lambda i: (counts[i], i))
 		self.exportCombo.setCurrentIndex(comboIndex)
 		self.setFromTimeSlider.click()
 		self.fix_format()
@@ -95,21 +81,10 @@ class Exporter(UIDocker):
 	# member functions
 	#===============================================
 	
-	def export_skeleton(self):
-		pass
-	
-	def export_camera(self):
-		
-		start, end = self.start.value(), self.end.value()
-		path = Path(self.path.text())
-		
-		# Validate the selection.
-		sel = ls(selection=True, dagObjects=True, cameras=True)
-		if not ls(selection=True):
-			return error('No cameras in selection.')
-		
-		# Associate the camera shapes with their parents.
-		cams = dict((s, s.getParent()) for s in sel)
+	def settings(self):
+		"""
+		Reads the export settings from the widgets.
+		"""
 		
 		# Pull-out only the attributes that are checked.
 		shape_atts = []
@@ -117,331 +92,51 @@ class Exporter(UIDocker):
 			if cb.isChecked():
 				[shape_atts.extend(str(cb.property(n).toString()).split('|')) \
 					for n in cb.dynamicPropertyNames() if n == 'shortName']
-		cam_atts = (cb.objectName() for cb \
-			in self.translation.findChildren(QCheckBox) if cb.isChecked())
-		attributes = (shape_atts, cam_atts)
-		
-		# Enable any locked or non-keyable channels.
-		for shape, cam in cams.items():
-			for i, obj in enumerate((shape, cam)):
-				for att in attributes[i]:
-					obj.attr(att).set('locked', False)
-					obj.attr(att).set('keyable', True)
-		
-		# Initialize the progress bar.
-		lc = len(cams)
-		self.progress_init(lc + lc * len([x for x in (self.createStandIn.isChecked(),
-			self.oneFile.isChecked() and self.oneFilePerNode.isChecked) if x]))
-		
-		# Bake the keys to the camera shape.
-		frame_range = self.animation.isChecked() and (start, end) or (start,)
-		for shape, cam in cams.items():
-			if self.aborted: return
-			
-			info('Baking keys to %s: %d-%d...' % \
-				((shape,) + frame_range))
-			bakeResults(shape, time=frame_range, simulation=True,
-				attribute=shape_atts)
-			info('%s keys %d-%d baked.' % ((shape,) + frame_range))
-			
-			self.progress_step()
-		
-		# Disable the cycle check warning.
-		cycleCheck(evaluation=False)
-		
-		# Create a null stand-in for the camera and bake keys to it.
-		#mel.source('channelBoxCommand.mel')
-		if self.createStandIn.isChecked():
-			for cam in cams.values():
-				if self.aborted: return
-				
-				stand_in = Transform(name='standInNull')
-				parentConstraint(cam, stand_in, name='nullParentConstraint')
-				info('Baking keys to the stand-in null...')
-				bakeResults(stand_in, time=frame_range, shape=True,
-					simulation=True, attribute=cam_atts)
-				info('Null keys baked.')
-				
-				# If the camera is a child, parent it to the world.
-				if cam.firstParent2():
-					cam.setParent(world=True)
-				
-				# Break existing connections between the rotate or translate
-				# attributes.
-				for att in cam_atts:
-					if connectionInfo(cam, isExactDestination=True):
-						disconnectAttr(connectionInfo(cam,
-							getExactDestination=True))
-						#mel.CBdeleteConnection(getExactDestination=True)
-				
-				# Constrain the camera to the null.
-				parentConstraint(stand_in, cam, name='cameraParentConstraint')
-				
-				# Bake the camera translate/rotate keys.
-				info('Baking keys to the camera...')
-				bakeResults(cam, time=frame_range, disableImplicitControl=True,
-					simulation=True, attribute=cam_atts)
-				info('Transform keys baked.')
-				
-				self.progress_step()
-				
-		# Remove excess elements unless optimize has been disabled.
-		if self.optimize.isChecked():
-			info('Optimizing scene...')
-			delete([s for s in ls(dagObjects=True) if s not in cams.keys() + \
-				cams.values() + ls(selection=True, type='animCurve')])
-		
-		# Save-out the cameras.
-		kwargs = dict(force=True, constructionHistory=False, channels=True,
-			constraints=False, expressions=False, shader=False,
-			type='mayaAscii')
-		ext = str(self.formatExt.text())
-		if self.oneFile.isChecked():
-			if self.oneFilePerNode.isChecked():
-				for cam in cams.values():
-					if self.aborted: return
-					select(cam)
-					exportSelected(path / cam.name() + ext, **kwargs)
-					self.progress_step()
-			else:
-				select(cams.values())
-				exportSelected(path / 'camera' + ext, **kwargs)
-		else:
-			error('Not implemented yet. Coming soon...')
-	
-	def write_mesh(self, path, name, **kwargs):
-		output_path = path / name
-		self.status.setText('Exporting: ~/%s.' % name)
-		if not self.copy_and_replace_all and output_path.exists():
-			click_result = confirmDialog(title='Write File',
-				message=os.linesep.join(( \
-				'There is already a file with the same name at this location.',
-				'What would you like to do?')),
-				button=('Copy and Replace all', 'Cancel'),
-				defaultButton='Copy and Replace all',
-				cancelButton='Cancel', dismissString='Cancel')
-			if click_result == 'Cancel':
-				self.aborted = True
-				return False
-			else:
-				self.copy_and_replace_all = True
-		if self.copy_and_replace_all or not output_path.exists():
-			# TODO: PyMEL's exportSelected(output_path, **kwargs),
-			# but it keeps spitting out mtl files, regardless of settings.
-			#from pymel.core.system import exportSelected
-			#exportSelected(output_path, force=True, type='OBJexport')
-			mc.file(output_path, **kwargs)
-		return True
-	
-	def export_mesh(self, **kwargs):
-		
-		format, ext = str(self.format.text()), str(self.formatExt.text())
-		format = self.name_pat.sub( \
-			lambda m: '%(name)' + m.group(1)[1:], format)
-		format = self.frame_pat.sub( \
-			lambda m: '%(frame)' + m.group(1)[1:], format)
-		path = Path(self.path.text())
-		
-		if not self.animation.isChecked() and self.oneFilePerNode.isChecked():
-			sel = ls(selection=True)
-			for s in sel:
-				select(s)
-				name = format % dict(name=s.name().replace('|', '')) + ext
-				self.write_mesh(path, name, **kwargs)
-			select(sel)
-		else:
-			
-			end, by = self.end.value(), self.by.value()
-			frame, renum_frame, renum_by = (self.frame, self.renum_frame,
-				self.renum_by)
-			
-			info('Exporting frames... Press Esc to cancel.')
-			self.progress_init(1)
-			while (by > 0 and frame <= end) or (by < 0 and frame >= end):
-				
-				if self.aborted: return
-				
-				setCurrentTime(frame)
-				if self.oneFilePerNode.isChecked():
-					sel = ls(selection=True)
-					for s in sel:
-						select(s)
-						name = format % dict(name=s.shortName(),
-							frame=renum_frame) + ext
-						if not self.write_mesh(path, name):
-							break
-				else:
-					name = format % dict(frame=renum_frame) + ext
-					if not self.write_mesh(path, name, **kwargs):
-						break
-				
-				# Prepare for the next iteration.
-				frame += by
-				renum_frame += renum_by
-				self.export_count += 1
-				self.progress_step()
-	
-	def export_skin_weights(self):
-		
-		format, ext = str(self.format.text()), str(self.formatExt.text())
-		format = self.name_pat.sub( \
-			lambda m: '%(name)' + m.group(1)[1:], format)
-		path = Path(self.path.text())
-		
-		# Validate selection.
-		sel = selected()
-		if not sel:
-			error('Selection is empty.')
-		
-		# Find the skin cluster.
-		sc = mel.findRelatedSkinCluster(sel[0])
-		skin_cluster = None
-		for s in sel:
-			sc = mel.findRelatedSkinCluster(s)
-			if sc:
-				skin_cluster = ls(sc)[0]
-				break
-		if not skin_cluster:
-			error('No skin cluster found.')
-		
-		for mesh in sel:
-			
-			mesh_element = Element('Mesh', name=mesh)
-			xml_tree = ElementTree(mesh_element)
-			
-			sc = mel.findRelatedSkinCluster(mesh)
-			if not sc: continue
-			sc = ls(sc)[0]
-			
-			influences = sc.influenceObjects()
-			inf_tag = SubElement(mesh_element, 'Influences')
-			for i, inf in enumerate(influences):
-				SubElement(inf_tag, 'Influence', index=str(i), name=inf)
-			#joints = ls(ios, type='joint')
-			#if len(joints) < len(ios):
-			#	error('Remove non-joint influences before exporting to Massive.')
-			
-			# TODO: progress bar
-			
-			name = format % dict(name=mesh.name().replace('|', '') \
-				.replace(':', '.')) + ext
-			with open(path / name, 'w') as f:
-				
-				#f.write(os.linesep + '# influences')
-				#for i, inf in enumerate(ios):
-				#	if inf in influences:
-				#		inf_index = influences.index(j)
-				#	else:
-				#		influences += (inf,)
-				#		inf_index = len(influences)
-					#f.write('%sdeformer %d %s' % (os.linesep, i, inf))
-				
-				#f.write(os.linesep)
-				
-				vertices = SubElement(mesh_element, 'Vertices')
-				
-				#f.write(os.linesep + '# weights')
-				for i, vtx in enumerate(mesh.vtx):
-					vertex = SubElement(vertices, 'Vertex', pos=str(vtx.getPosition()))
-					#f.write('%s%d: ' % (os.linesep, vi))
-					for ii, inf in enumerate(influences):
-						weight_val = skinPercent(sc, '%s.vtx[%d]' % (mesh, i),
-							transform=inf, query=True)
-						if weight_val:
-							SubElement(vertex, 'Weight', influence=str(ii),
-								value=str(weight_val))
-							#f.write(' %d %f' % (ii, weight_val))
-				
-				
-				
-				#f.write(os.linesep + ':')
-				rough_string = tostring(xml_tree.getroot(), 'utf-8')
-				reparsed = minidom.parseString(rough_string)
-				f.write(reparsed.toprettyxml(indent='\t'))
+		cam_atts = [str(cb.objectName()) for cb \
+			in self.translation.findChildren(QCheckBox) if cb.isChecked()]
+		
+		obj_options = dict(groups=self.groups, ptgroups=self.pointGroups,
+			materials=self.materials, smoothing=self.smoothing,
+			normals=self.normals)
+		settings = ExportSettings(type=TYPES[self.exportCombo.currentIndex()],
+			path=str(self.path.text()), format=str(self.format.text()),
+			ext=str(self.formatExt.text()), start=self.start.value(),
+			end=self.end.value(), by=self.by.value(),
+			animation=self.animation.isChecked(),
+			one_file=self.oneFile.isChecked(),
+			one_file_per_node=self.oneFilePerNode.isChecked(),
+			point_cache=self.onePointCache.isChecked(),
+			native_obj=self.nativeObj.isChecked(),
+			obj_options=dict((k, cb.isChecked()) \
+				for k, cb in obj_options.items()),
+			held_frames=HELD_FRAMES[self.heldFrames.currentIndex()],
+			update_existing=self.updateExisting.isChecked(),
+			context_sampling=self.contextSampling.isChecked(),
+			suspend_refresh=self.suspendRefresh.isChecked(),
+			streams=[n for n, cb in (('camera', self.streamCameras),
+				('joint', self.streamJoints)) if cb.isChecked()],
+			shape_attributes=shape_atts, transform_attributes=cam_atts,
+			create_stand_in=self.createStandIn.isChecked(),
+			optimize=self.optimize.isChecked(),
+			bake_cameras=self.bakeCameras.isChecked(),
+			camera_ma=self.cameraMa.isChecked(),
+			world_joints=self.worldJoints.isChecked())
+		if not self.writeBehind.isChecked():
+			settings.write_threads = 0
+		if self.compression.currentIndex():
+			settings.compression = str(self.compression.currentText())
+			settings.compression_level = self.compressionLevel.value()
+		if self.renumFrames.isChecked():
+			settings.renum_start = self.renumStart.value()
+			settings.renum_by = self.renumBy.value()
+		return settings
 	
 	def fix_format(self, ignore_scene=False):
 		"""
 		Creates a Python string format based on the name already supplied in
 		the format text box and the total number of frames that will be exported.
 		"""
-		
-		# Set short names for vars.
-		start, end, by, renum_start, renum_by = (self.start.value(),
-			self.end.value(), self.by.value(),
-			self.renumStart.value(), self.renumBy.value())
-		
-		# Determine whether to use float values for the string format.
-		boxes = self.renumFrames.isChecked() \
-			and (renum_start, renum_by) or (start, by) 
-		is_float = True in [x != int(x) for x in boxes]
-		dorf = is_float and '.2f' or 'd'
-		
-		# Figure out how much padding to use.
-		padding = len(str(self.total_frames()))
-		if is_float:
-			padding += 3  # Decimal + 2 precision slots count as padding.
-		
-		# Break-up the format text box into segments and replace any
-		# existing string formats with the new one.
-		format = str(self.format.text())
-		if not self.oneFilePerNode.isChecked():
-			format = self.name_pat.sub('', format)
-		if not self.animation.isChecked():
-			format = self.frame_pat.sub('', format)
-		segs = self.split_pat.split(format)
-		frame = [s for s in segs if self.frame_pat.match(s)]
-		
-		if not ignore_scene:
-			if self.oneFilePerNode.isChecked():
-				if '%s' not in segs:
-					if frame:
-						i = segs.index(frame[0])
-						segs.insert(i, '.')
-						segs.insert(i, '%s')
-						segs.insert(i, '.')
-					elif not segs:
-						segs.append('%s')
-					else:
-						segs.extend(['.', '%s'])
-			elif not segs:
-				segs.append('geo')
-			if self.animation.isChecked():
-				if not frame:
-					segs.extend(['.', '%d'])
-				for i, s in enumerate(segs):
-					if self.frame_pat.match(s):
-						segs[i] = '%%0%d' % padding + dorf
-		
-		# Put all the pieces back together.
-		format = ''.join(segs).replace('..', '.')
-		if format.startswith('.'):
-			format = format[1:]
-		if format.endswith('.obj'):
-			format = format[:-4]
-		if format.endswith('.'):
-			format = format[:-1]
-		self.format.setText(format)
-	
-	def progress_init(self, loop_checks=1):
-		min, max, self.step = self.animation.isChecked() and \
-			(int(x.value() * 100) for x in (self.start, self.end, self.by)) or \
-			(0, 100 * loop_checks, 100)
-		
-		# Start the main progress bar.
-		self.main_progress.setIsInterruptable(True)
-		self.main_progress.setMaxValue(sys.maxsize)
-		self.main_progress.setMinValue(-sys.maxsize)
-		self.main_progress.setMaxValue(max)
-		self.main_progress.setMinValue(min)
-		self.main_progress.beginProgress()
-		
-		# Start the local progress bar.
-		self.progress.setRange(min, max)
-		self.progress.setValue(min)
-	
-	def progress_step(self):
-		self.main_progress.step(self.step)
-		self.progress.setValue(int(self.progress.value()) + self.step)
+		self.format.setText(fix_format(self.settings(), ignore_scene))
 	
 	def set_path(self, sd=workspace.getPath()):
 		"""
@@ -456,24 +151,6 @@ class Exporter(UIDocker):
 			self.path.setText(path)
 		return path
 	
-	def total_frames(self):
-		start, end, by = (self.start.value(), self.end.value(), self.by.value())
-		return int((end - start) / by + by)
-	
-	#===============================================
-	# properties
-	#===============================================
-	
-	@property
-	def aborted(self):
-		if self.main_progress.getIsCancelled():
-			self._aborted = True
-		return self._aborted
-	
-	@aborted.setter
-	def aborted(self, value):
-		self._aborted = value
-	
 	#===============================================
 	# PyQt slots
 	#===============================================
@@ -484,13 +161,19 @@ class Exporter(UIDocker):
 		self.animation.setEnabled(animation_enabled)
 		
 		self.objOptions.setHidden(index != 2)
+		self.matchByPosition.setHidden(index != 3)
+		self.matchNearest.setHidden(index != 3)
 		self.cameraChannels.setHidden(index != 1)
 		self.animationChannelsTopLine.setHidden(index != 1)
 		
-		self.formatExt.setText(('.ma', '.ma', '.obj', '.xml')[index])
-		self.oneFilePerNode.setText('One file per ' + \
-			('joint chain', 'camera', 'mesh', 'skin')[index])
-		self.createStandIn.setChecked(index == 1)
+		self.formatExt.setText(EXTENSIONS[index])
+		self.oneFilePerNode.setText('One file per ' + NODE_NAMES[index])
+		self.heldFrames.setHidden(index != 2)
+		self.updateExisting.setHidden(index != 2)
+		self.streamCameras.setHidden(index != 2)
+		self.streamJoints.setHidden(index != 2)
+		self.worldJoints.setHidden(index != 0)
+		self.createStandIn.setChecked(index in (1, 2))
 		self.createStandIn.setEnabled(index == 1)
 		self.on_animation_clicked(self.animation.isChecked())
 		self.exportButton.setText('Export ' + self.exportCombo.currentText())
@@ -514,6 +197,8 @@ class Exporter(UIDocker):
 		self.oneFilePerFrame.setEnabled(checked)
 		self.oneFilePerFrame.setChecked(ofpf)
 		self.oneFile.setChecked(not ofpf)
+		self.onePointCache.setEnabled(checked and \
+			self.exportCombo.currentIndex() == 2)
 		for w, text in self.animation_widgets:
 			w.setEnabled(checked)
 		self.setFromTimeSlider.click()
@@ -600,6 +285,14 @@ class Exporter(UIDocker):
 	def on_oneFilePerNode_clicked(self, checked):
 		self.fix_format()
 	
+	@pyqtSlot(bool)
+	def on_onePointCache_toggled(self, checked):
+		if checked:
+			self.formatExt.setText(POINT_CACHE_EXT)
+		elif self.exportCombo.currentIndex() == 2:
+			self.formatExt.setText('.obj')
+		self.fix_format()
+	
 	@pyqtSlot(bool)
 	def on_exportAll_toggled(self, checked):
 		self.export_toggled()
@@ -615,51 +308,73 @@ class Exporter(UIDocker):
 		else:
 			ExportOptions()
 	
+	@pyqtSlot(bool)
+	def on_nativeObj_toggled(self, checked):
+		for cb in (self.pointGroups, self.materials, self.smoothing):
+			cb.setEnabled(not checked)
+		self.writeBehind.setEnabled(checked)
+		self.compression.setEnabled(checked)
+		if not checked:
+			self.compression.setCurrentIndex(0)
+	
+	@pyqtSlot(bool)
+	def on_bakeCameras_toggled(self, checked):
+		
+		# Only a bake changes the scene, to be optimized; sampled cameras
+		# get their own .ma.
+		self.optimize.setEnabled(checked)
+		self.cameraMa.setEnabled(not checked)
+	
+	@pyqtSlot(int)
+	def on_compression_currentIndexChanged(self, index):
+		self.compressionLevel.setEnabled(index > 0)
+		if index > 0:
+			codec = str(self.compression.currentText())
+			self.compressionLevel.setRange(*LEVELS[codec])
+			self.compressionLevel.setValue(DEFAULT_LEVELS[codec])
+	
+	@pyqtSlot(bool)
+	def on_matchByPosition_toggled(self, checked):
+		self.matchNearest.setEnabled(checked)
+	
 	@pyqtSlot()
 	def on_loadWeightsButton_clicked(self):
+		path, ext = Path(self.path.text()), str(self.formatExt.text())
+		if ext not in SKIN_FORMATS:
+			ext = '.xml'
+		count = 0
 		for mesh in selected():
 			sc = mel.findRelatedSkinCluster(mesh)
 			if not sc: continue
-			sc = ls(sc)[0]
-			
-			doc = ElementTree(file=path + mesh.nodeName().replace('|', '').replace(':', '.') + '.xml')
 			
-			influences = [inf.attrib['name'] for inf in doc.findall('//Influence')]
-			for i, vtx in enumerate(doc.findall('//Vertex')):
-				weights = [(influences[int(w.attrib['influence'])],
-					float(w.attrib['value'])) for w in vtx.findall('Weight')]
-				skinPercent(sc, '%s.vtx[%d]' % (mesh, i),
-					transformValue=weights)
+			# Stream XML in fixed-size batches so large files never sit in
+			# memory whole. Binary files are memory-mapped and set in one go.
+			# Matching by position needs the whole table up front.
+			name = mesh.nodeName().replace('|', '').replace(':', '.') + ext
+			try:
+				if self.matchByPosition.isChecked():
+					weights = transfer_by_position(
+						load_skin_weights(path / name), read_positions(mesh),
+						self.matchNearest.value())
+					apply_skin_weights(mesh, weights, sc)
+				elif ext == '.xml':
+					apply_skin_weight_batches(mesh, iter_xml(path / name), sc)
+				else:
+					apply_skin_weights(mesh, read_binary(path / name), sc)
+			except (IOError, ValueError) as e:
+				error(str(e))
+				continue
+			count += 1
+		result('Loaded skin weights onto %d mesh%s.' % (count,
+			count != 1 and 'es' or ''))
 	
 	@pyqtSlot()
 	def on_exportButton_clicked(self):
 		
-		if not ls(selection=True):
+		sel = ls(selection=True)
+		if not sel:
 			return error('Nothing is currently selected.')
 		
-		# Load the objExport plug-in if it hasn't been already.
-		kwargs = {}
-		if self.formatExt.text() == '.obj':
-			mll = 'objExport.mll'
-			if not pluginInfo(mll, query=True, loaded=True):
-				try:
-					loadPlugin(mll)
-					info('Loaded plug-in: ' + mll)
-				except:
-					return error('Failed loading plug-in: ' + mll)
-			#kwargs = dict(force=True, constructionHistory=False,
-			#	channels=False, constraints=False, expressions=True,
-			#	shader=False, preserveReferences=False, type='OBJexport')
-			options = dict(groups=self.groups, ptgroups=self.pointGroups,
-				materials=self.materials, smoothing=self.smoothing,
-				normals=self.normals)
-			options = ';'.join('%s=%d' % (k, cb.isChecked()) \
-				for k, cb in options.items())
-			kwargs = dict(exportSelected=True, type='OBJexport', force=True,
-				options=options)
-		elif self.exportCombo.currentIndex() == 2:  # mesh
-			return error('Unsupported extension: %s.' % self.formatExt.text())
-		
 		# Validate the output path.
 		output_path = Path(self.path.text())
 		if not output_path.exists():
@@ -680,47 +395,49 @@ class Exporter(UIDocker):
 			if click_result == 'Cancel':
 				return
 		
-		# Validate the format.
-		format = str(self.format.text())
+		engine = ExportEngine(self.settings(), ExporterReporter(self))
 		try:
-			format % (start + by)
-		except TypeError:
-			return error('Invalid format: "%s". ' % format + \
-				'Click the \'...\' tool button for help.' % format)
+			engine.validate()
+		except FormatError as e:
+			return error(str(e) + ' Click the \'...\' tool button for help.')
+		except ExportError as e:
+			return error(str(e))
 		
 		# Disable UI elements while running.
 		[o.show() for o in self.run_showers]
 		[o.setEnabled(False) for o in self.run_disablers]
 		
-		# Set the range.
-		if self.renumFrames.isChecked():
-			renum_start = self.renumStart.value()
-			self.renum_by = self.renumBy.value()
-		else:
-			renum_start = start
-			self.renum_by = by
-		self.frame, self.renum_frame = start, renum_start
-		
-		# Set loop vars.
-		self.aborted = False
-		self.export_count = 0
-		self.copy_and_replace_all = False
-		
-		# Call the appropriate export function.
-		(self.export_skeleton, self.export_camera, self.export_mesh,
-			self.export_skin_weights)[self.exportCombo.currentIndex()](**kwargs)
-		
-		self.main_progress.endProgress()
-		
-		# Enable UI elements back.
-		[o.hide() for o in self.run_showers]
-		[o.setEnabled(True) for o in self.run_disablers]
-		
-		# Report results.
-		if self.aborted:
-			msg = 'Aborted with %s exported'
+		try:
+			engine.run(sel)
+		except ExportError as e:
+			error(str(e))
 		else:
-			msg = 'Successfully exported %s'
-		plural = self.export_count != 1 and 's' or ''
-		frames = '%d frame' % self.export_count + plural
-		result(msg % frames + ' to: %s.' % output_path)
\ No newline at end of file
+			result(engine.summary())
+		finally:
+			
+			# Enable UI elements back, leaving the status label up with the
+			# summary of where the time went.
+			self.progress.hide()
+			[o.setEnabled(True) for o in self.run_disablers]
+
+
+class ExporterReporter(ProgressReporter, Reporter):
+	"""
+	Shows an export's progress in the Exporter's own widgets and in Maya's
+	main progress bar, a few times a second at most, and asks before
+	overwriting files.
+	"""
+	
+	def __init__(self, exporter):
+		ProgressReporter.__init__(self, exporter.progress, exporter.status,
+			exporter.main_progress)
+	
+	def confirm_overwrite(self, path):
+		click_result = confirmDialog(title='Write File',
+			message=os.linesep.join(( \
+			'There is already a file with the same name at this location.',
+			'What would you like to do?')),
+			button=('Copy and Replace all', 'Cancel'),
+			defaultButton='Copy and Replace all',
+			cancelButton='Cancel', dismissString='Cancel')
+		return click_result != 'Cancel'
@@ -12,6 +12,7 @@ from lava.core.general import result
 from lava.core.rigging.character import base
 from lava.core.rigging.character import polyped
 from lava.core.ui.base import UIDocker
+from lava.core.ui.progress import ProgressReporter
 
 
 class Rigger(UIDocker):
@@ -108,27 +109,33 @@ class Rigger(UIDocker):
 	def on_rigAndSmoothBindButton_clicked(self):
 		self.bottomWidget.show()
 		self.topWidget.setEnabled(False)
-		
-		character = polyped.Polyped( \
-			vbr=True,
-			lbr=self.longBoneRadiusSpinBox.value(),
-			sbr=self.shortBoneRadiusSpinBox.value(),
-			tbr=self.tipBoneRadiusSpinBox.value(),
-			#===========================
-			djl=str(self.driveJointLineEdit.text()),
-			bjl=str(self.bindJointLineEdit.text()),
-			nhpat=str(self.nhpatLineEdit.text()),
-			#===========================
-			ss=self.stretchySpineCheckBox.isChecked(),
-			sn=self.stretchyNeckCheckBox.isChecked(),
-			st=self.stretchyTailCheckBox.isChecked(),
-			sap=self.stretchyAppendageCheckBox.isChecked(),
-			sa=self.stretchyShoulderCheckBox.isChecked(),
-			sl=self.stretchyHipCheckBox.isChecked(),
-			eshj=self.insertShoulderJointsSpinBox.value(),
-			efj=self.insertForearmJointsSpinBox.value(),
-			ehj=self.insertHipJointsSpinBox.value(),
-			eknj=self.insertKneeJointsSpinBox.value())
-		
-		self.topWidget.setEnabled(True)
-		self.bottomWidget.hide()
+		reporter = ProgressReporter(self.progress, self.status,
+			interruptable=False)
+		reporter.begin(1, 'Rigging and smooth binding...')
+		try:
+			character = polyped.Polyped( \
+				vbr=True,
+				lbr=self.longBoneRadiusSpinBox.value(),
+				sbr=self.shortBoneRadiusSpinBox.value(),
+				tbr=self.tipBoneRadiusSpinBox.value(),
+				#===========================
+				djl=str(self.driveJointLineEdit.text()),
+				bjl=str(self.bindJointLineEdit.text()),
+				nhpat=str(self.nhpatLineEdit.text()),
+				#===========================
+				ss=self.stretchySpineCheckBox.isChecked(),
+				sn=self.stretchyNeckCheckBox.isChecked(),
+				st=self.stretchyTailCheckBox.isChecked(),
+				sap=self.stretchyAppendageCheckBox.isChecked(),
+				sa=self.stretchyShoulderCheckBox.isChecked(),
+				sl=self.stretchyHipCheckBox.isChecked(),
+				eshj=self.insertShoulderJointsSpinBox.value(),
+				efj=self.insertForearmJointsSpinBox.value(),
+				ehj=self.insertHipJointsSpinBox.value(),
+				eknj=self.insertKneeJointsSpinBox.value())
+			
+			reporter.step()
+		finally:
+			reporter.end()
+			self.topWidget.setEnabled(True)
+			self.bottomWidget.hide()
@@ -9,6 +9,7 @@ from pymel.core.runtime import SmoothBindSkin
 from PyQt4.QtCore import pyqtSlot
 
 from lava.core.ui.base import UIDocker
+from lava.core.ui.progress import ProgressReporter
 
 
 class Spliner(UIDocker):
@@ -26,39 +27,53 @@ class Spliner(UIDocker):
 		self.bottomWidget.show()
 		self.topWidget.setEnabled(False)
 		
-		dj_chains, output_curves = (), ()
-		for root in selected():
-			dj_chain = (root,)
-			while dj_chain[-1].numChildren():
-				dj_chain += (dj_chain[-1].getChildren()[0],)
-			dj_chains += (dj_chain,)
+		# A step per chain for its curve and one for its IK, plus one for
+		# the hair system.
+		roots = selected()
+		reporter = ProgressReporter(self.progress, self.status,
+			interruptable=False)
+		reporter.begin(2 * len(roots) + 1, 'Creating curves...')
+		try:
+			dj_chains, output_curves = (), ()
+			for root in roots:
+				dj_chain = (root,)
+				while dj_chain[-1].numChildren():
+					dj_chain += (dj_chain[-1].getChildren()[0],)
+				dj_chains += (dj_chain,)
+				
+				# Assign a hair system to the driver joint chain.
+				output_curves += ( \
+					curve(p=[dj.getTranslation(space='world').get() \
+					for dj in dj_chain]),)
+				reporter.step()
 			
-			# Assign a hair system to the driver joint chain.
-			output_curves += ( \
-				curve(p=[dj.getTranslation(space='world').get() \
-				for dj in dj_chain]),)
-		
-		select(output_curves)
-		mel.eval('assignNewHairSystem')
-		follicle_curves = selected()
-		
-		hs = follicle_curves[0].getParent().getShape().attr('outHair') \
-			.outputs()[0]
-		
-		[hs.attr(x).set(0) for x in \
-			('drag', 'friction', 'mass', 'gravity', 'dynamicsWeight')]
-		
-		hs.attr('startCurveAttract').set(0.25)
-		
-		for i, dj_chain in enumerate(dj_chains):
-			oc = output_curves[i]
-			select(dj_chain + (oc,))
-			SmoothBindSkin()
-			bjs = [dj.attr('rotate').outputs()[0].attr('constraintRotateZ') \
-				.outputs()[0] for dj in (dj_chain[0], dj_chain[-1])]
-			ikHandle(startJoint=bjs[0], endEffector=bjs[1],
-				curve=oc, solver='ikSplineSolver',
-				parentCurve=False, createCurve=False)
-		
-		self.topWidget.setEnabled(True)
-		self.bottomWidget.hide()
+			reporter.status('Assigning a hair system...')
+			select(output_curves)
+			mel.eval('assignNewHairSystem')
+			follicle_curves = selected()
+			
+			hs = follicle_curves[0].getParent().getShape().attr('outHair') \
+				.outputs()[0]
+			
+			[hs.attr(x).set(0) for x in \
+				('drag', 'friction', 'mass', 'gravity', 'dynamicsWeight')]
+			
+			hs.attr('startCurveAttract').set(0.25)
+			reporter.step()
+			
+			reporter.status('Creating spline IK handles...')
+			for i, dj_chain in enumerate(dj_chains):
+				oc = output_curves[i]
+				select(dj_chain + (oc,))
+				SmoothBindSkin()
+				bjs = [dj.attr('rotate').outputs()[0] \
+					.attr('constraintRotateZ').outputs()[0] \
+					for dj in (dj_chain[0], dj_chain[-1])]
+				ikHandle(startJoint=bjs[0], endEffector=bjs[1],
+					curve=oc, solver='ikSplineSolver',
+					parentCurve=False, createCurve=False)
+				reporter.step()
+		finally:
+			reporter.end()
+			self.topWidget.setEnabled(True)
+			self.bottomWidget.hide()
@@ -0,0 +1,237 @@
+"""
+Runs a Lava export without Maya's UI, e.g. on a render node:
+
+	mayapy -m lava.core.export.batch [options] scene
+
+Run it with --help for the options. With --jobs, the frame range is split
+into chunks, each exported by its own mayapy process. Maya has to be started
+before anything imports pymel.core, so the modules that need it are imported
+inside the functions below, once it is.
+"""
+
+#=================================================
+# external imports
+#=================================================
+
+import os
+import sys
+from optparse import OptionParser
+from optparse import SUPPRESS_HELP
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.pointcache import EXT as POINT_CACHE_EXT
+from lava.core.export.settings import ExportSettings
+from lava.core.export.settings import EXTENSIONS
+from lava.core.export.settings import fix_format
+from lava.core.export.settings import HELD_FRAMES
+from lava.core.export.settings import STREAMS
+from lava.core.export.settings import TYPES
+from lava.core.export.shard import export_sharded
+from lava.util.compression import CODECS
+
+#=================================================
+# constants
+#=================================================
+
+USAGE = '%prog [options] scene'
+
+#=================================================
+# functions
+#=================================================
+
+def parse_args(args=None):
+	parser = OptionParser(usage=USAGE)
+	parser.add_option('-t', '--type', choices=TYPES, default='mesh',
+		help='what to export: %s [default: %%default]' % ', '.join(TYPES))
+	parser.add_option('-s', '--select', action='append', default=[],
+		metavar='NODE', help='a node to export; may be repeated')
+	parser.add_option('--set', action='append', default=[], dest='sets',
+		metavar='SET', help='export the members of a set; may be repeated')
+	parser.add_option('-o', '--output', default=os.getcwd(), metavar='DIR',
+		help='output directory [default: the current directory]')
+	parser.add_option('-f', '--format', default='', help='file name ' + \
+		'format, with %s for the node name and %d for the frame number ' + \
+		'[default: one is made up from the other options]')
+	parser.add_option('-e', '--ext', help='file extension, e.g. .obj ' + \
+		'[default: the export type\'s usual one]')
+	parser.add_option('--start', type='float', help='first frame ' + \
+		'[default: the start of the scene\'s playback range]')
+	parser.add_option('--end', type='float', help='last frame ' + \
+		'[default: the end of the scene\'s playback range]')
+	parser.add_option('--by', type='float', help='frame step ' + \
+		'[default: the scene\'s playback step]')
+	parser.add_option('--renum-start', type='float',
+		help='renumber the frames, starting here')
+	parser.add_option('--renum-by', type='float',
+		help='renumbered frame step [default: --by]')
+	parser.add_option('--static', action='store_false', dest='animation',
+		default=True, help='export the start frame only')
+	parser.add_option('--per-node', action='store_true',
+		help='one file per node instead of one for the whole selection')
+	parser.add_option('--one-file', action='store_true',
+		help='every frame in one file (cameras)')
+	parser.add_option('--point-cache', action='store_true',
+		help='one point cache per mesh instead of a file per frame')
+	parser.add_option('--maya-obj', action='store_false', dest='native_obj',
+		default=True, help='write OBJ files with Maya\'s objExport plug-in')
+	parser.add_option('--write-threads', type='int', default=2,
+		help='threads writing native OBJ files behind the export, or 0 ' + \
+		'to write them on the main thread [default: %default]')
+	parser.add_option('--compress', choices=CODECS, metavar='CODEC',
+		help='compress native OBJ files as they\'re written: %s' % \
+		', '.join(CODECS))
+	parser.add_option('--level', type='int',
+		help='compression level [default: the codec\'s own]')
+	parser.add_option('--held-frames', choices=HELD_FRAMES, default='write',
+		help='what to do with frames that match an earlier one: %s ' % \
+		', '.join(HELD_FRAMES) + '[default: %default]')
+	parser.add_option('--update', action='store_true',
+		help='only write the frames that changed since the last run')
+	parser.add_option('--step-time', action='store_false',
+		dest='context_sampling', default=True, help='move the scene\'s ' + \
+		'time to each frame instead of evaluating it in a DG context, ' + \
+		'e.g. for simulations')
+	parser.add_option('--force', action='store_true',
+		help='overwrite existing files')
+	parser.add_option('--no-timings', action='store_false', dest='timings',
+		default=True, help='don\'t save a report of how long each stage ' + \
+		'of the export took')
+	parser.add_option('--channels', default='', help='comma-separated ' + \
+		'camera shape attributes to bake, e.g. fl,fs')
+	parser.add_option('--transform-channels', default='tx,ty,tz,rx,ry,rz',
+		help='comma-separated camera transform attributes to bake ' + \
+		'[default: %default]')
+	parser.add_option('--streams', default='', help='comma-separated ' + \
+		'extra streams to sample in the same pass as a mesh export, ' + \
+		'written as the camera and skeleton exports write them: ' + \
+		'%s' % ', '.join(STREAMS))
+	parser.add_option('--stand-in', action='store_true',
+		help='bake cameras through a stand-in null or, when sampling ' + \
+		'them, sample them in world space')
+	parser.add_option('--bake', action='store_true', dest='bake_cameras',
+		help='bake cameras in the scene and export them from it, instead ' + \
+		'of sampling their channels without changing the scene')
+	parser.add_option('--no-ma', action='store_false', dest='camera_ma',
+		default=True, help='only write sampled cameras\' channel files, ' + \
+		'without a Maya ASCII file')
+	parser.add_option('--world-joints', action='store_true',
+		help='sample skeletons in world space instead of relative to ' + \
+		'each joint\'s parent')
+	parser.add_option('--no-optimize', action='store_false', dest='optimize',
+		default=True, help='don\'t delete the rest of the scene before ' + \
+		'saving cameras')
+	parser.add_option('-j', '--jobs', type='int', default=1,
+		help='split the frames into chunks, exporting this many at a ' + \
+		'time, each in its own mayapy process [default: %default]')
+	parser.add_option('--chunk-size', type='int', metavar='FRAMES',
+		help='frames per chunk [default: the frames split evenly between ' + \
+		'the jobs]')
+	parser.add_option('--manifest-part', type='int', help=SUPPRESS_HELP)
+	options, args = parser.parse_args(args)
+	if len(args) != 1:
+		parser.error('Expected one scene, got %d.' % len(args))
+	if not options.select and not options.sets:
+		parser.error('Nothing to export: use --select or --set.')
+	if options.jobs > 1:
+		if options.type != 'mesh' or options.point_cache or \
+			not options.animation:
+			parser.error('Only per-frame mesh exports can be split into jobs.')
+		if options.start is None or options.end is None:
+			parser.error('Give the frame range (--start, --end) to split it.')
+		if options.by is None:
+			options.by = 1.0
+	return options, args[0]
+
+def settings_from_options(options):
+	"""
+	Builds the export settings from parsed command-line options, filling
+	the frame range in from the open scene where it wasn't given.
+	"""
+	start, end, by = options.start, options.end, options.by
+	if None in (start, end, by):
+		from pymel.core.animation import playbackOptions
+		if start is None:
+			start = playbackOptions(query=True, minTime=True)
+		if end is None:
+			end = playbackOptions(query=True, maxTime=True)
+		if by is None:
+			by = playbackOptions(query=True, by=True)
+	ext = options.ext or (options.point_cache and POINT_CACHE_EXT or \
+		EXTENSIONS[list(TYPES).index(options.type)])
+	settings = ExportSettings(type=options.type,
+		path=os.path.abspath(options.output), format=options.format,
+		ext=ext.startswith('.') and ext or '.' + ext, start=start, end=end,
+		by=by, animation=options.animation, one_file=bool(options.one_file),
+		one_file_per_node=bool(options.per_node),
+		point_cache=bool(options.point_cache), native_obj=options.native_obj,
+		held_frames=options.held_frames, update_existing=bool(options.update),
+		manifest_part=options.manifest_part,
+		write_threads=max(0, options.write_threads),
+		compression=options.compress, compression_level=options.level,
+		context_sampling=options.context_sampling, overwrite=bool(options.force),
+		timings=options.timings,
+		shape_attributes=[a for a in options.channels.split(',') if a],
+		transform_attributes=[a for a in \
+			options.transform_channels.split(',') if a],
+		streams=[n for n in options.streams.split(',') if n],
+		create_stand_in=bool(options.stand_in), optimize=options.optimize,
+		bake_cameras=bool(options.bake_cameras), camera_ma=options.camera_ma,
+		world_joints=bool(options.world_joints))
+	if options.renum_start is not None:
+		settings.renum_start = options.renum_start
+		settings.renum_by = options.renum_by or by
+	settings.format = fix_format(settings, bool(options.format))
+	return settings
+
+def selection(nodes, sets):
+	"""
+	Returns the given nodes and the members of the given sets.
+	"""
+	from maya import cmds as mc
+	from pymel.core.general import ls
+	names = list(nodes)
+	for s in sets:
+		names.extend(mc.sets(s, query=True) or [])
+	return ls(names)
+
+def main(args=None):
+	if args is None:
+		args = sys.argv[1:]
+	options, scene = parse_args(args)
+
+	# The chunks run in processes of their own; this one needs no Maya.
+	if options.jobs > 1:
+		settings = settings_from_options(options)
+		if not os.path.isdir(settings.path):
+			os.makedirs(settings.path)
+		return export_sharded(args, settings, options.jobs,
+			options.chunk_size) and 1 or 0
+
+	import maya.standalone
+	maya.standalone.initialize(name='python')
+	from maya import cmds as mc
+	from lava.core.export.engine import ExportEngine
+	from lava.core.export.engine import ExportError
+
+	mc.file(scene, open=True, force=True)
+	settings = settings_from_options(options)
+	if not os.path.isdir(settings.path):
+		os.makedirs(settings.path)
+	engine = ExportEngine(settings)
+	try:
+		engine.run(selection(options.select, options.sets))
+	except (ExportError, ValueError) as e:
+		sys.stderr.write('Error: %s\n' % e)
+		return 1
+	sys.stdout.write(engine.summary() + '\n')
+	if engine.aborted:
+		if not settings.overwrite:
+			sys.stderr.write('Use --force to overwrite existing files.\n')
+		return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
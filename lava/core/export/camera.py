@@ -0,0 +1,227 @@
+#=================================================
+# external imports
+#=================================================
+
+import math
+from array import array
+
+from maya import OpenMaya as om
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.channels import ChannelWriter
+from lava.core.export.nodes import dag_path
+from lava.core.export.nodes import depend_node
+from lava.core.export.nodes import time_context
+from lava.core.export.timeline import Stream
+
+#=================================================
+# constants
+#=================================================
+
+# Transform channels read off the world matrix, by short and long name, as
+# indices into (tx, ty, tz, rx, ry, rz).
+WORLD_CHANNELS = dict(tx=0, ty=1, tz=2, rx=3, ry=4, rz=5, translateX=0,
+	translateY=1, translateZ=2, rotateX=3, rotateY=4, rotateZ=5)
+
+# Channels sampled in centimeters or radians, which Maya ASCII keys as
+# distance or angle curves; any other channel is unitless.
+LINEAR = ('tx', 'ty', 'tz', 'translateX', 'translateY', 'translateZ', 'fd',
+	'focusDistance', 'coi', 'centerOfInterest', 'ncp', 'nearClipPlane', 'fcp',
+	'farClipPlane', 'ow', 'orthographicWidth')
+ANGULAR = ('rx', 'ry', 'rz', 'rotateX', 'rotateY', 'rotateZ', 'sa',
+	'shutterAngle')
+
+TIME_UNITS = {15.0: 'game', 24.0: 'film', 25.0: 'pal', 30.0: 'ntsc',
+	48.0: 'show', 50.0: 'palf', 60.0: 'ntscf'}
+KEYS_PER_LINE = 8
+
+#=================================================
+# classes
+#=================================================
+
+class CameraStream(Stream):
+	"""
+	Samples the chosen transform and shape channels of a set of cameras
+	every frame into a channel file, keeping the samples to build a Maya
+	ASCII file from at the end, if given a path for one. Nothing is baked,
+	constrained or deleted. In world space, the transform channels come off
+	each camera's world matrix, the way baking through a stand-in null and
+	unparenting the camera would leave them. Otherwise they're relative to
+	the camera's parent, which the Maya ASCII file doesn't recreate.
+
+	Cameras are (transform, shape) pairs of long names.
+	"""
+
+	stage = 'cameras'
+
+	def __init__(self, path, cameras, transform_attributes, shape_attributes,
+		frames, sample_rate, world=True, ma_path=None):
+		self.path, self.ma_path = path, ma_path
+		self.cameras, self.world = list(cameras), world
+		self.transform_attributes = list(transform_attributes)
+		self.shape_attributes = list(shape_attributes)
+		self.frames, self.sample_rate = list(frames), sample_rate
+		self.names = []
+		for transform, shape in self.cameras:
+			self.names += ['%s.%s' % (transform, a) \
+				for a in self.transform_attributes]
+			self.names += ['%s.%s' % (shape, a) for a in self.shape_attributes]
+		self.writer = None
+		self.values = array('d')
+		self.rotate_orders = None
+
+	def begin(self):
+
+		# Each channel reads either a plug or a component of its camera's
+		# decomposed world matrix.
+		self.channels, self.matrices, self.orders = [], [], []
+		for i, (transform, shape) in enumerate(self.cameras):
+			fn = om.MFnDependencyNode(depend_node(transform))
+			self.orders.append(fn.findPlug('rotateOrder'))
+			if self.world:
+				path = dag_path(transform)
+				self.matrices.append(fn.findPlug('worldMatrix') \
+					.elementByLogicalIndex(path.instanceNumber()))
+			for attribute in self.transform_attributes:
+				if self.world and attribute in WORLD_CHANNELS:
+					self.channels.append((i, WORLD_CHANNELS[attribute]))
+				else:
+					self.channels.append((None, fn.findPlug(attribute)))
+			fn = om.MFnDependencyNode(depend_node(shape))
+			for attribute in self.shape_attributes:
+				self.channels.append((None, fn.findPlug(attribute)))
+		self.rotations = [None] * len(self.matrices)
+		self.writer = ChannelWriter(self.path, self.names, self.frames,
+			self.sample_rate)
+
+	def _world(self, i, context):
+		"""
+		Returns a camera's world translation and rotation, in its own
+		rotation order, kept closest to the last frame's to avoid flips.
+		"""
+		if context is None:
+			data, order = self.matrices[i].asMObject(), self.orders[i].asShort()
+		else:
+			data = self.matrices[i].asMObject(context)
+			order = self.orders[i].asShort(context)
+		xform = om.MTransformationMatrix(om.MFnMatrixData(data).matrix())
+		t = xform.getTranslation(om.MSpace.kWorld)
+		r = xform.eulerRotation()
+		r.reorderIt(order)
+		if self.rotations[i] is not None:
+			r.setToClosestSolution(self.rotations[i])
+		self.rotations[i] = r
+		return (t.x, t.y, t.z, r.x, r.y, r.z)
+
+	def sample(self, frame, renum_frame, time):
+		context = time is not None and time_context(time) or None
+		worlds = [self._world(i, context) for i in range(len(self.matrices))]
+		if self.rotate_orders is None:
+			if context is None:
+				self.rotate_orders = [o.asShort() for o in self.orders]
+			else:
+				self.rotate_orders = [o.asShort(context) for o in self.orders]
+		row = []
+		for i, reader in self.channels:
+			if i is not None:
+				row.append(worlds[i][reader])
+			elif context is None:
+				row.append(reader.asDouble())
+			else:
+				row.append(reader.asDouble(context))
+		self.writer.write(row)
+		self.values.extend(row)
+
+	def end(self):
+		if self.writer is None:
+			return
+		self.writer.close()
+		count = len(self.values) // max(1, len(self.names))
+		if self.ma_path and count:
+			with open(self.ma_path, 'w') as f:
+				write_ma(f, self.cameras, self.transform_attributes,
+					self.shape_attributes, self.frames[:count], self.values,
+					self.sample_rate, self.rotate_orders)
+
+#=================================================
+# functions
+#=================================================
+
+def node_name(name):
+	"""
+	Returns the node name an exported long name gets in a Maya ASCII file.
+	"""
+	return name.rsplit('|', 1)[-1].replace(':', '_')
+
+def curve_type(attribute):
+	if attribute in LINEAR:
+		return 'animCurveTL'
+	if attribute in ANGULAR:
+		return 'animCurveTA'
+	return 'animCurveTU'
+
+def ma_value(attribute, value):
+	"""
+	Converts a sampled value to the units the file declares: centimeters
+	and degrees.
+	"""
+	if attribute in ANGULAR:
+		return math.degrees(value)
+	return value
+
+def write_ma(f, cameras, transform_attributes, shape_attributes, frames,
+	values, sample_rate, rotate_orders=None):
+	"""
+	Writes cameras to an open file as Maya ASCII, from the rows of values a
+	CameraStream sampled (one row per frame, one value per channel), as a
+	transform and camera shape per camera with an animation curve per
+	channel. A single frame is set instead of keyed. Each transform gets its
+	camera's rotation order, which the rotations were sampled in; cameras
+	come out unparented.
+	"""
+	unit = TIME_UNITS.get(float(sample_rate), '%gfps' % sample_rate)
+	f.write('//Maya ASCII scene\n')
+	f.write('requires maya "2008";\n')
+	f.write('currentUnit -l centimeter -a degree -t %s;\n' % unit)
+
+	stride = len(cameras) * (len(transform_attributes) + \
+		len(shape_attributes))
+	column, connections = 0, []
+	rotate_orders = rotate_orders or [0] * len(cameras)
+	for (transform, shape), order in zip(cameras, rotate_orders):
+		transform_name, shape_name = node_name(transform), node_name(shape)
+		f.write('createNode transform -n "%s";\n' % transform_name)
+		if order:
+			f.write('\tsetAttr ".ro" %d;\n' % order)
+		f.write('createNode camera -n "%s" -p "%s";\n' % (shape_name,
+			transform_name))
+		for node, attributes in ((transform_name, transform_attributes),
+			(shape_name, shape_attributes)):
+			for attribute in attributes:
+				samples = [ma_value(attribute, values[i * stride + column]) \
+					for i in range(len(frames))]
+				column += 1
+				if len(frames) == 1:
+					connections.append('setAttr "%s.%s" %.10g;\n' % (node,
+						attribute, samples[0]))
+					continue
+				curve = '%s_%s' % (node, attribute)
+				f.write('createNode %s -n "%s";\n' % (curve_type(attribute),
+					curve))
+				f.write('\tsetAttr ".tan" 18;\n')
+				f.write('\tsetAttr ".wgt" no;\n')
+				f.write('\tsetAttr -s %d ".ktv[0:%d]"' % (len(frames),
+					len(frames) - 1))
+				for i in range(0, len(frames), KEYS_PER_LINE):
+					f.write(' ' + ' '.join('%.10g %.10g' % key for key in \
+						zip(frames[i:i + KEYS_PER_LINE],
+						samples[i:i + KEYS_PER_LINE])))
+					if i + KEYS_PER_LINE < len(frames):
+						f.write('\n\t\t')
+				f.write(';\n')
+				connections.append('connectAttr "%s.o" "%s.%s";\n' % (curve,
+					node, attribute))
+	f.writelines(connections)
@@ -0,0 +1,77 @@
+#=================================================
+# external imports
+#=================================================
+
+from array import array
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.framed import FramedReader
+from lava.core.export.framed import FramedWriter
+from lava.core.export.framed import pack_name
+from lava.core.export.framed import unpack_name
+
+#=================================================
+# constants
+#=================================================
+
+# Binary layout (see lava.core.export.framed), all little-endian:
+#   header      magic, version, flags, channel count, frame count, byte offset
+#               of the first frame and sample rate (frames per second)
+#   names       each channel's name ("node.attribute"), as a uint16 byte
+#               length followed by utf-8 bytes, zero-padded to 8 bytes in all
+#   frame list  float64[frame count], the frame number of each sample
+#   frames      float64[frame count][channel count], one row of channel
+#               values per frame, starting at the first frame offset
+MAGIC = b'LCHN'
+VERSION = 1
+EXT = '.lch'
+
+#=================================================
+# classes
+#=================================================
+
+class ChannelWriter(FramedWriter):
+	"""
+	Writes a fixed set of animation channels for a known list of frames to a
+	channel file, a row of values per frame. As with point caches, close()
+	shrinks the frame count to what was written, so an aborted export leaves
+	a readable file.
+	"""
+
+	magic = MAGIC
+	version = VERSION
+	typecode = 'd'
+	unit = 'channels'
+
+	def __init__(self, path, names, frames, sample_rate):
+		self.names = [str(n) for n in names]
+		FramedWriter.__init__(self, path, len(self.names),
+			b''.join(pack_name(n) for n in self.names), frames, sample_rate)
+
+class Channels(FramedReader):
+	"""
+	Reads a channel file through a memory map: a frame's row of values or a
+	channel's values over every frame.
+	"""
+
+	magic = MAGIC
+	version = VERSION
+	typecode = 'd'
+	kind = 'channel'
+
+	def read_records(self, offset):
+		self.names = []
+		for i in range(self.count):
+			name, offset = unpack_name(self.buffer, offset)
+			self.names.append(name)
+		return offset
+
+	def channel(self, name):
+		"""
+		Returns a channel's value at every frame.
+		"""
+		j = self.names.index(name)
+		return array('d', self.rows()[j::self.count])
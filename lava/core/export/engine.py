@@ -0,0 +1,860 @@
+#=================================================
+# external imports
+#=================================================
+
+import os
+import threading
+
+from maya import cmds as mc
+from maya import OpenMaya as om
+from pymel.core.animation import bakeResults
+from pymel.core.animation import parentConstraint
+from pymel.core.animation import setCurrentTime
+from pymel.core.general import connectionInfo
+from pymel.core.general import cycleCheck
+from pymel.core.general import disconnectAttr
+from pymel.core.general import ls
+from pymel.core.general import select
+from pymel.core.language import mel
+from pymel.core.nodetypes import Transform
+from pymel.core.system import exportSelected
+from pymel.core.system import loadPlugin
+from pymel.core.system import Path
+from pymel.core.system import pluginInfo
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.camera import CameraStream
+from lava.core.export.channels import EXT as CHANNELS_EXT
+from lava.core.export.manifest import hash_buffers
+from lava.core.export.manifest import link
+from lava.core.export.manifest import Manifest
+from lava.core.export.manifest import point_bounds
+from lava.core.export.nodes import mesh_path
+from lava.core.export.nodes import read_points
+from lava.core.export.obj import ObjWriter
+from lava.core.export.prune import prune
+from lava.core.export.settings import HELD_FRAMES
+from lava.core.export.settings import manifest_name
+from lava.core.export.settings import NAME_PAT
+from lava.core.export.settings import named_format
+from lava.core.export.settings import STREAMS
+from lava.core.export.settings import stream_name
+from lava.core.export.settings import timings_name
+from lava.core.export.settings import TYPES
+from lava.core.export.skeleton import EXT as SKELETON_EXT
+from lava.core.export.skeleton import joint_order
+from lava.core.export.skeleton import SkeletonStream
+from lava.core.export.skinweights import FORMATS as SKIN_FORMATS
+from lava.core.export.skinweights import read_skin_weights
+from lava.core.export.skinweights import save_skin_weights
+from lava.core.export.timeline import PointCacheStream
+from lava.core.export.timeline import Stream
+from lava.core.export.timeline import TimelineSampler
+from lava.core.general import info
+from lava.util.compression import CODECS
+from lava.util.compression import EXTENSIONS as COMPRESSION_EXTENSIONS
+from lava.util.compression import LEVELS
+from lava.util.timers import StageTimer
+from lava.util.writequeue import WriteQueue
+
+#=================================================
+# constants
+#=================================================
+
+OBJ_PLUGIN = 'objExport.mll'
+
+#=================================================
+# classes
+#=================================================
+
+class ExportError(Exception):
+	"""
+	Raised when an export can't run with the given settings or selection.
+	"""
+
+class FormatError(ExportError):
+	"""
+	Raised when the file name format can't name the export's files.
+	"""
+
+class Reporter(object):
+	"""
+	Receives an export's progress and answers its questions. This one logs
+	to the script editor or console; front ends override what they show.
+	"""
+
+	def begin(self, total):
+		pass
+
+	def step(self, count=1):
+		pass
+
+	def end(self):
+		pass
+
+	def status(self, text):
+		info(text)
+
+	def cancelled(self):
+		return False
+
+	def confirm_overwrite(self, path):
+		"""
+		Asked once, when a file to be written already exists. Returning True
+		overwrites it and every other existing file; False aborts the run.
+		"""
+		return False
+
+class MeshFileStream(Stream):
+	"""
+	Writes each frame's mesh file, or a file per node with meshes under it,
+	through an export engine's write_mesh.
+	"""
+
+	def __init__(self, engine, path, format, ext, sel, writers, shapes,
+		kwargs):
+		self.engine, self.path, self.format, self.ext = engine, path, format, ext
+		self.sel, self.writers, self.shapes = sel, writers, shapes
+		self.kwargs = kwargs
+		self.current_time = not writers  # Maya's objExport
+
+	def sample(self, frame, renum_frame, time):
+		write_mesh, format, ext = self.engine.write_mesh, self.format, self.ext
+		timer = self.engine.timer
+		if not self.engine.settings.one_file_per_node:
+			name = format % dict(frame=renum_frame) + ext
+			return write_mesh(self.path, name, self.writers.get(None),
+				renum_frame, self.shapes.get(None, ()), time, **self.kwargs)
+		try:
+			for n in self.sel:
+				if not self.shapes.get(n):
+					continue
+				with timer.stage('select'):
+					select(n)
+				name = format % dict(name=n.shortName(), frame=renum_frame) + ext
+				if not write_mesh(self.path, name, self.writers.get(n),
+					renum_frame, self.shapes.get(n, ()), time, **self.kwargs):
+					return False
+		finally:
+			with timer.stage('select'):
+				select(self.sel)
+
+class ExportEngine(object):
+	"""
+	Runs an export of the given nodes with the given settings, with no UI
+	of its own. The Exporter docker and the batch entry point are both front
+	ends over it.
+	"""
+
+	def __init__(self, settings, reporter=None):
+		self.settings = settings
+		self.reporter = reporter or Reporter()
+		self._aborted = False
+		self.overwrite = settings.overwrite
+		self.export_count = 0
+		self.up_to_date = 0
+		self.manifest = self.previous = None
+		self.write_queue = None
+		self.written = {}  # Events set once a queued file has been written.
+		self.timer = StageTimer()
+
+	@property
+	def aborted(self):
+		if not self._aborted and self.reporter.cancelled():
+			self._aborted = True
+		return self._aborted
+
+	@aborted.setter
+	def aborted(self, value):
+		self._aborted = value
+
+	def validate(self):
+		"""
+		Raises an ExportError if the settings can't produce an export.
+		"""
+		s = self.settings
+		if s.type not in TYPES:
+			raise ExportError('Unknown export type: %s. Use one of: %s.' % \
+				(s.type, ', '.join(TYPES)))
+		if s.held_frames not in HELD_FRAMES:
+			raise ExportError('Unknown held frames option: %s.' % s.held_frames)
+		for stream in s.streams:
+			if stream not in STREAMS:
+				raise ExportError('Unknown stream: %s. Use any of: %s.' % \
+					(stream, ', '.join(STREAMS)))
+		if s.type == 'mesh' and s.ext != '.obj' and not s.point_cache:
+			raise ExportError('Unsupported extension: %s.' % s.ext)
+		if s.type == 'mesh' and s.point_cache and \
+			not NAME_PAT.search(s.format):
+			raise FormatError('A point cache format needs a %s field for ' \
+				'the mesh name.')
+		if s.compression:
+			if s.compression not in CODECS:
+				raise ExportError('Unsupported compression: %s. Use one of: ' \
+					'%s.' % (s.compression, ', '.join(CODECS)))
+			if s.type != 'mesh' or s.point_cache or not s.native_obj:
+				raise ExportError('Only the cached topology OBJ writer can ' \
+					'compress its files.')
+			low, high = LEVELS[s.compression]
+			if s.compression_level is not None and \
+				not low <= s.compression_level <= high:
+				raise ExportError('The %s level must be from %d to %d.' % \
+					(s.compression, low, high))
+		if s.type == 'skin' and s.ext not in SKIN_FORMATS:
+			raise ExportError('Unsupported extension: %s. Use one of: %s.' % \
+				(s.ext, ', '.join(SKIN_FORMATS)))
+		if not s.by or (s.renum_by is not None and not s.renum_by):
+			raise ExportError('"By frame" cannot be equal to zero.')
+		if not os.path.isdir(s.path):
+			raise ExportError('Output directory does not exist: %s.' % s.path)
+		try:
+			named_format(s.format) % dict(name='node', frame=s.start + s.by)
+		except (KeyError, TypeError, ValueError):
+			raise FormatError('Invalid format: "%s".' % s.format)
+
+	def run(self, sel):
+		"""
+		Exports the nodes in sel. The manifest of a per-frame mesh export is
+		saved even if the run is aborted or fails part way.
+		"""
+		self.validate()
+		if not sel:
+			raise ExportError('Nothing is selected.')
+		suspend = self.settings.suspend_refresh
+		if suspend:
+			mc.refresh(suspend=True)
+		try:
+			getattr(self, 'export_' + self.settings.type)(sel)
+		finally:
+			if suspend:
+				mc.refresh(suspend=False)
+
+			# Let queued writes finish, so the manifest gets their sizes. A
+			# write error, of any kind, is raised once the manifest is saved,
+			# unless the export already failed with an error of its own.
+			error = None
+			try:
+				if self.write_queue is not None:
+					try:
+						with self.timer.stage('queue wait'):
+							self.write_queue.close()
+					except Exception as e:
+						error = e
+					self.write_queue = None
+				if self.manifest is not None:
+					# A shard's partial manifest only lists its own frames;
+					# the sharded run merges the previous entries in at the
+					# end.
+					with self.timer.stage('manifest'):
+						if self.previous is not None and \
+							self.settings.manifest_part is None:
+							self.manifest.merge(self.previous)
+						self.manifest.save()
+				self.save_timings()
+			finally:
+				self.reporter.end()
+		if error is not None:
+			raise error
+
+	def save_timings(self):
+		"""
+		Shows which stages of the run took the most time and, unless turned
+		off, saves every stage's totals and percentiles next to the output.
+		"""
+		s = self.settings
+		self.reporter.status(self.timer.summary())
+		if not s.timings:
+			return
+		path = Path(s.path) / timings_name(s.format, s.manifest_part)
+		try:
+			self.timer.save(path)
+		except EnvironmentError as e:
+			info('Failed saving the timing report %s: %s' % (path, e))
+
+	def summary(self):
+		if self.aborted:
+			msg = 'Aborted with %s exported'
+		else:
+			msg = 'Successfully exported %s'
+		plural = self.export_count != 1 and 's' or ''
+		frames = '%d frame' % self.export_count + plural
+		if self.up_to_date:
+			frames += ' (%d already up to date)' % self.up_to_date
+		return msg % frames + ' to: %s.' % self.settings.path
+
+	def export_skeleton(self, sel):
+		"""
+		Samples the joints at and under the selected roots over the frame
+		range into a skeleton file: their translate, rotation quaternion and
+		scale on every frame, in world space or relative to their parents,
+		for every joint chain or one per chain.
+		"""
+		s = self.settings
+		path = Path(s.path)
+		joints = joint_order(j.longName() for j in \
+			ls(sel, dagObjects=True, type='joint'))
+		if not joints:
+			raise ExportError('No joints in selection.')
+		if s.one_file_per_node:
+			# Group each joint with the top-most joint above it.
+			lookup, groups = set(joints), {}
+			for joint in joints:
+				parts = joint.split('|')
+				root = [p for p in ('|'.join(parts[:i]) \
+					for i in range(2, len(parts) + 1)) if p in lookup][0]
+				groups.setdefault(root, []).append(joint)
+			groups = [(root.rsplit('|', 1)[-1], groups[root]) \
+				for root in joint_order(groups)]
+		else:
+			groups = [('skeleton', joints)]
+
+		frames = list(s.frames())
+		if not s.animation:
+			frames = frames[:1]
+		sampler = TimelineSampler(frames)
+		renum_frames = [r for f, r in frames]
+		fps = mel.currentTimeUnitToFPS()
+		for name, group in groups:
+			output_path = path / name.replace(':', '.') + s.ext
+			if not self.can_write(output_path):
+				return
+			sampler.add(SkeletonStream(output_path, group, renum_frames, fps,
+				s.world_joints))
+
+		info('Sampling %d joints... Press Esc to cancel.' % len(joints))
+		self.sample(sampler)
+
+	def export_camera(self, sel):
+		if not self.settings.bake_cameras:
+			return self.sample_cameras(sel)
+		s = self.settings
+		path = Path(s.path)
+
+		# Validate the selection.
+		shapes = ls(sel, dagObjects=True, cameras=True)
+		if not shapes:
+			raise ExportError('No cameras in selection.')
+
+		# Associate the camera shapes with their parents.
+		cams = [c.getParent() for c in shapes]
+		shape_atts, cam_atts = s.shape_attributes, s.transform_attributes
+		attributes = (shape_atts, cam_atts)
+
+		# Enable any locked or non-keyable channels.
+		for shape, cam in zip(shapes, cams):
+			for i, obj in enumerate((shape, cam)):
+				for att in attributes[i]:
+					obj.attr(att).set('locked', False)
+					obj.attr(att).set('keyable', True)
+
+		# Initialize the progress bar.
+		lc = len(cams)
+		self.reporter.begin(lc + lc * len([x for x in (s.create_stand_in,
+			s.one_file and s.one_file_per_node) if x]))
+
+		# Every bake simulates the whole frame range, so each phase bakes
+		# all the cameras in a single call, however many there are.
+		frame_range = s.animation and (s.start, s.end) or (s.start,)
+		frames = '-'.join('%d' % f for f in frame_range)
+		if self.aborted: return
+		info('Baking keys to %d camera shapes: %s...' % (lc, frames))
+		with self.timer.stage('bake'):
+			bakeResults(shapes, time=frame_range, simulation=True,
+				attribute=shape_atts)
+		info('Camera shape keys %s baked.' % frames)
+		self.reporter.step(lc)
+
+		# Disable the cycle check warning.
+		cycleCheck(evaluation=False)
+
+		# Create a null stand-in for each camera and bake keys to them.
+		#mel.source('channelBoxCommand.mel')
+		if s.create_stand_in:
+			if self.aborted: return
+			stand_ins = []
+			for cam in cams:
+				stand_in = Transform(name='standInNull')
+				parentConstraint(cam, stand_in, name='nullParentConstraint')
+				stand_ins.append(stand_in)
+			info('Baking keys to the stand-in nulls...')
+			with self.timer.stage('bake'):
+				bakeResults(stand_ins, time=frame_range, shape=True,
+					simulation=True, attribute=cam_atts)
+			info('Null keys baked.')
+
+			for cam, stand_in in zip(cams, stand_ins):
+
+				# If the camera is a child, parent it to the world.
+				if cam.firstParent2():
+					cam.setParent(world=True)
+
+				# Break existing connections between the rotate or translate
+				# attributes.
+				for att in cam_atts:
+					plug = cam.attr(att)
+					if connectionInfo(plug, isExactDestination=True):
+						disconnectAttr(connectionInfo(plug,
+							getExactDestination=True))
+						#mel.CBdeleteConnection(getExactDestination=True)
+
+				# Constrain the camera to the null.
+				parentConstraint(stand_in, cam, name='cameraParentConstraint')
+
+			# Bake the camera translate/rotate keys.
+			if self.aborted: return
+			info('Baking keys to the cameras...')
+			with self.timer.stage('bake'):
+				bakeResults(cams, time=frame_range,
+					disableImplicitControl=True, simulation=True,
+					attribute=cam_atts)
+			info('Transform keys baked.')
+			self.reporter.step(lc)
+
+		# Remove everything the cameras don't depend on, unless optimize has
+		# been disabled.
+		if s.optimize:
+			info('Optimizing scene...')
+			with self.timer.stage('optimize'):
+				count = prune([c.longName() for c in cams])
+			info('Deleted %d nodes the cameras don\'t depend on.' % count)
+
+		# Save-out the cameras.
+		kwargs = dict(force=True, constructionHistory=False, channels=True,
+			constraints=False, expressions=False, shader=False,
+			type='mayaAscii')
+		if not s.one_file:
+			raise ExportError('Not implemented yet. Coming soon...')
+		if s.one_file_per_node:
+			for cam in cams:
+				if self.aborted: return
+				select(cam)
+				with self.timer.stage('export'):
+					exportSelected(path / cam.name() + s.ext, **kwargs)
+				self.export_count += 1
+				self.reporter.step()
+		else:
+			select(cams)
+			with self.timer.stage('export'):
+				exportSelected(path / 'camera' + s.ext, **kwargs)
+			self.export_count += 1
+
+	def sample_cameras(self, sel):
+		"""
+		Exports the selected cameras without baking or deleting anything in
+		the scene: their channels are sampled over the frame range into a
+		channel file and, unless turned off, a Maya ASCII file built from the
+		samples, for every camera or one per camera.
+		"""
+		s = self.settings
+		path = Path(s.path)
+		shapes = ls(sel, dagObjects=True, cameras=True)
+		if not shapes:
+			raise ExportError('No cameras in selection.')
+		if s.one_file_per_node:
+			groups = [(c.getParent().name(), [c]) for c in shapes]
+		else:
+			groups = [('camera', shapes)]
+
+		frames = list(s.frames())
+		if not s.animation:
+			frames = frames[:1]
+		sampler = TimelineSampler(frames)
+		renum_frames = [r for f, r in frames]
+		fps = mel.currentTimeUnitToFPS()
+		for name, group in groups:
+			name = name.replace(':', '.')
+			ma_path = s.camera_ma and path / name + s.ext or None
+			for output_path in (path / name + CHANNELS_EXT, ma_path):
+				if output_path and not self.can_write(output_path):
+					return
+			sampler.add(CameraStream(path / name + CHANNELS_EXT,
+				[(c.getParent().longName(), c.longName()) for c in group],
+				s.transform_attributes, s.shape_attributes, renum_frames, fps,
+				s.create_stand_in, ma_path))
+
+		info('Sampling %d cameras... Press Esc to cancel.' % len(shapes))
+		self.sample(sampler)
+
+	def go_to(self, frame, current_time=False):
+		"""
+		Gets ready to sample a frame and returns the frame to evaluate the
+		exported nodes at, or None to read them at the current time. Sampling
+		in a DG context moves nothing; Maya's own exporters only read the
+		current time, so for them the time is set for real: under the
+		Evaluation Manager, moving it without an update leaves the meshes at
+		the last frame. Suspending refresh keeps that from redrawing.
+		"""
+		if not self.settings.context_sampling or current_time:
+			setCurrentTime(frame)
+			return None
+		return frame
+
+	def write_mesh(self, path, name, writer=None, frame=None, shapes=(),
+		time=None, **kwargs):
+		s, timer = self.settings, self.timer
+		output_path = path / name
+		with timer.stage('progress'):
+			self.reporter.status('Exporting: ~/%s.' % name)
+
+		# Hash what the file would hold to find frames matching earlier ones.
+		payload = None
+		with timer.stage('sample'):
+			if writer:
+				shapes = writer.paths()
+				payload = writer.sample(time)
+				points = [p for p, normals in payload]
+				buffers = points + [n for p, n in payload if n is not None]
+			else:
+				points = buffers = [read_points(p, om.MSpace.kWorld, time) \
+					for p in shapes]
+		with timer.stage('hash'):
+			digest = hash_buffers(buffers,
+				' '.join(p.fullPathName() for p in shapes))
+			bounds = point_bounds(points)
+			source = self.manifest.find(digest)
+
+		# Files an earlier run left up to date are kept as they are.
+		if self.previous is not None:
+			with timer.stage('update check'):
+				entry = self.previous.current(name, digest, path, source)
+			if entry:
+				self.manifest.keep(entry)
+				self.up_to_date += 1
+				return True
+
+		if source and s.held_frames == 'reference':
+			self.manifest.add(name, digest, frame, source['name'],
+				bounds=bounds)
+			return True
+
+		with timer.stage('exists check'):
+			if not self.can_write(output_path):
+				return False
+		if s.held_frames == 'link' and source and \
+			self.wait_for(source['name']):
+			with timer.stage('link'):
+				linked = link(path / source['name'], output_path)
+			if linked:
+				self.manifest.add(name, digest, frame, source['name'], True,
+					output_path.getsize(), bounds)
+				return True
+		# TODO: PyMEL's exportSelected(output_path, **kwargs),
+		# but it keeps spitting out mtl files, regardless of settings.
+		#from pymel.core.system import exportSelected
+		#exportSelected(output_path, force=True, type='OBJexport')
+		if writer:
+			entry = self.manifest.add(name, digest, frame, bounds=bounds)
+			done = None
+			if self.write_queue is not None:
+				done = self.written[name] = threading.Event()
+			self.write(self.save_mesh, writer, output_path, payload, entry,
+				done)
+		else:
+			with timer.stage('file write'):
+				mc.file(output_path, **kwargs)
+			self.manifest.add(name, digest, frame, size=output_path.getsize(),
+				bounds=bounds)
+		return True
+
+	def can_write(self, output_path):
+		"""
+		Returns whether a file can be written. The first time one already
+		exists, the reporter is asked whether to overwrite it and every other
+		one; if not, the run is aborted.
+		"""
+		if self.overwrite or not output_path.exists():
+			return True
+		if not self.reporter.confirm_overwrite(output_path):
+			self.aborted = True
+			return False
+		self.overwrite = True
+		return True
+
+	def save_mesh(self, writer, output_path, payload, entry, done=None):
+		"""
+		Writes a sampled payload to a file, compressing it as it's written if
+		asked to, and records its size, then sets the done event, if given.
+		Runs on a writer thread when writing behind, so it mustn't touch the
+		scene.
+		"""
+		s = self.settings
+		try:
+			with self.timer.stage('file write'):
+				raw_size = writer.save(output_path, payload, s.compression,
+					s.compression_level)
+			entry['size'] = os.path.getsize(output_path)
+			if s.compression:
+				entry.update(compression=s.compression, raw_size=raw_size)
+		except EnvironmentError as e:
+			raise ExportError('Failed writing %s: %s' % (output_path, e))
+		finally:
+			if done is not None:
+				done.set()
+
+	def write(self, job, *args):
+		"""
+		Runs a write job on the write-behind queue or, without one, now.
+		"""
+		if self.write_queue is None:
+			job(*args)
+		else:
+			with self.timer.stage('queue wait'):
+				self.write_queue.put(job, *args)
+
+	def wait_for(self, name):
+		"""
+		Waits for a file queued earlier in the run to be written, leaving the
+		rest of the queue running. Returns True once it has been, so it can be
+		chained into conditions, or raises the error it failed with.
+		"""
+		done = self.written.get(name)
+		if done is None:
+			return True
+		with self.timer.stage('queue wait'):
+			while not done.is_set():
+				done.wait(0.1)
+
+				# Jobs after a failed one never run, so they're never set.
+				if self.write_queue.failed:
+					self.write_queue.check()
+					return False
+		return True
+
+	def mesh_writers(self, sel):
+		"""
+		Creates Lava's own OBJ writers for the selection, one per node with
+		meshes under it or one for everything, which read the topology and
+		UVs only once per run.
+		"""
+		options = self.settings.obj_options
+		kwargs = dict(groups=options['groups'], normals=options['normals'])
+		shapes = lambda x: ls(x, dagObjects=True, type='mesh',
+			noIntermediate=True)
+		if self.settings.one_file_per_node:
+			return dict((n, ObjWriter(shapes(n), **kwargs)) for n in sel \
+				if shapes(n))
+		return {None: ObjWriter(shapes(sel), **kwargs)}
+
+	def obj_export_kwargs(self):
+		"""
+		Loads Maya's objExport plug-in, if it hasn't been already, and returns
+		the file command arguments that export the selection with it.
+		"""
+		if not pluginInfo(OBJ_PLUGIN, query=True, loaded=True):
+			try:
+				loadPlugin(OBJ_PLUGIN)
+				info('Loaded plug-in: ' + OBJ_PLUGIN)
+			except:
+				raise ExportError('Failed loading plug-in: ' + OBJ_PLUGIN)
+		#kwargs = dict(force=True, constructionHistory=False,
+		#	channels=False, constraints=False, expressions=True,
+		#	shader=False, preserveReferences=False, type='OBJexport')
+		options = ';'.join('%s=%d' % (k, v) \
+			for k, v in self.settings.obj_options.items())
+		return dict(exportSelected=True, type='OBJexport', force=True,
+			options=options)
+
+	def export_mesh(self, sel):
+		s = self.settings
+		format, ext = named_format(s.format), s.ext
+		path = Path(s.path)
+		if s.compression:
+			ext += COMPRESSION_EXTENSIONS[s.compression]
+		if s.point_cache:
+			return self.export_point_caches(path, format, ext, sel)
+
+		# Only nodes with meshes under them get files; cameras and joints in
+		# the selection are left to the extra streams.
+		shapes = {}
+		groups = s.one_file_per_node and [(n, n) for n in sel] or [(None, sel)]
+		for key, nodes in groups:
+			shapes[key] = [mesh_path(m) for m in ls(nodes,
+				dagObjects=True, type='mesh', noIntermediate=True)]
+		if not [key for key in shapes if shapes[key]]:
+			raise ExportError('No meshes in selection.')
+
+		# Streams' files are checked before anything's written, unless only a
+		# single frame of each node gets exported, without them.
+		if s.animation or not s.one_file_per_node:
+			sampler = self.sampler(sel)
+			if sampler is None:
+				return
+		writers, kwargs = {}, {}
+		if s.native_obj:
+			writers = self.mesh_writers(sel)
+
+			# The native writers' payloads are sampled up front, so the files
+			# can be formatted and written behind, while the next frame is.
+			if s.write_threads:
+				self.write_queue = WriteQueue(s.write_threads,
+					s.write_queue_size)
+		else:
+			kwargs = self.obj_export_kwargs()
+
+		# Every file's points are hashed into a manifest, which finds held
+		# frames and lets a later run update only what has changed. The
+		# native writers sample the points anyway; Maya's exporter needs them
+		# read.
+		self.manifest = Manifest(path / manifest_name(s.format,
+			s.manifest_part))
+		previous = path / manifest_name(s.format)
+		if s.update_existing and previous.exists():
+			self.previous = Manifest.load(previous)
+
+		if not s.animation and s.one_file_per_node:
+			for n in sel:
+				if not shapes[n]:
+					continue
+				select(n)
+				name = format % dict(name=n.name().replace('|', '')) + ext
+				self.write_mesh(path, name, writers.get(n),
+					shapes=shapes.get(n, ()), **kwargs)
+				self.export_count += 1
+			select(sel)
+			return
+
+		sampler.add(MeshFileStream(self, path, format, ext, sel, writers,
+			shapes, kwargs))
+		info('Exporting frames... Press Esc to cancel.')
+		self.sample(sampler)
+
+	def export_point_caches(self, path, format, ext, sel):
+		"""
+		Writes every frame of each selected mesh into a single point cache
+		file per mesh, instead of a file per frame.
+		"""
+
+		sampler = self.sampler(sel)
+		if sampler is None:
+			return
+		stream = sampler.add(PointCacheStream())
+		renum_frames = [r for f, r in sampler.frames]
+		fps = mel.currentTimeUnitToFPS()
+		names = set()
+		try:
+			for shape in ls(sel, dagObjects=True, type='mesh',
+				noIntermediate=True):
+				name = format % dict(name=shape.getParent().shortName() \
+					.replace(':', '.')) + ext
+				if name in names:
+					raise ExportError('More than one mesh would be cached ' \
+						'to %s. Rename them or export them separately.' % name)
+				names.add(name)
+				if not self.can_write(path / name):
+					stream.end()
+					return
+				stream.add(mesh_path(shape), path / name, shape.getParent(),
+					shape.numVertices(), renum_frames, fps)
+		except:
+			stream.end()
+			raise
+
+		info('Exporting point caches... Press Esc to cancel.')
+		self.reporter.status('Caching %d meshes.' % len(stream.writers))
+		self.sample(sampler)
+
+	def sampler(self, sel):
+		"""
+		Returns a timeline sampler over the frame range, or only its first
+		frame without animation, with a stream for each of the settings'
+		extra streams, so cameras and joints in the selection get sampled in
+		the same pass as the meshes. Returns None if a stream's file exists
+		and mustn't be overwritten.
+		"""
+		s = self.settings
+		frames = list(s.frames())
+		if not s.animation:
+			frames = frames[:1]
+		sampler = TimelineSampler(frames)
+		renum_frames = [r for f, r in sampler.frames]
+		fps = mel.currentTimeUnitToFPS()
+		for name in s.streams:
+			stream = self.extra_stream(name, sel, renum_frames, fps)
+			if stream is None:
+				continue
+			stream, output_paths = stream
+			for output_path in output_paths:
+				if not self.can_write(output_path):
+					return None
+			sampler.add(stream)
+		return sampler
+
+	def extra_stream(self, stream, sel, frames, sample_rate):
+		"""
+		Returns an extra stream over the selection and the files it writes,
+		or None if there's nothing in the selection for it. Cameras and
+		joints are sampled as the camera and skeleton exports sample them.
+		"""
+		s, path = self.settings, Path(self.settings.path)
+		if stream == 'camera':
+			shapes = ls(sel, dagObjects=True, cameras=True)
+			if not shapes:
+				return None
+			output_path = path / stream_name(s.format, stream)
+			ma_path = s.camera_ma and \
+				path / stream_name(s.format, stream, '.ma') or None
+			return CameraStream(output_path,
+				[(c.getParent().longName(), c.longName()) for c in shapes],
+				s.transform_attributes, s.shape_attributes, frames,
+				sample_rate, s.create_stand_in, ma_path), \
+				[p for p in (output_path, ma_path) if p]
+		if stream == 'joint':
+			joints = joint_order(j.longName() for j in \
+				ls(sel, dagObjects=True, type='joint'))
+			if not joints:
+				return None
+			output_path = path / stream_name(s.format, stream, SKELETON_EXT)
+			return SkeletonStream(output_path, joints, frames, sample_rate,
+				s.world_joints), [output_path]
+		raise ExportError('Unknown stream: %s.' % stream)
+
+	def sample(self, sampler):
+		self.reporter.begin(len(sampler.frames))
+		sampler.run(self._go_to, lambda: self.aborted, self._sampled,
+			self.timer)
+
+	def _go_to(self, frame, current_time):
+		with self.timer.stage('time change'):
+			return self.go_to(frame, current_time)
+
+	def _sampled(self, frame):
+		self.export_count += 1
+		with self.timer.stage('progress'):
+			self.reporter.step()
+
+	def export_skin(self, sel):
+		s = self.settings
+		format, ext = named_format(s.format), s.ext
+		path = Path(s.path)
+
+		skinned = []
+		for mesh in sel:
+			sc = mel.findRelatedSkinCluster(mesh)
+			if sc:
+				skinned.append((mesh, ls(sc)[0]))
+		if not skinned:
+			raise ExportError('No skin cluster found.')
+
+		self.reporter.begin(len(skinned))
+		for mesh, sc in skinned:
+			if self.aborted: return
+
+			# Pull the whole weight table and every position in bulk.
+			with self.timer.stage('read weights'):
+				weights = read_skin_weights(mesh, sc)
+			#joints = ls(ios, type='joint')
+			#if len(joints) < len(ios):
+			#	error('Remove non-joint influences before exporting to Massive.')
+
+			# Stream the elements straight to the file instead of building,
+			# serializing and re-parsing a whole document, or write the
+			# compact binary layout if that's the chosen extension.
+			name = format % dict(name=mesh.name().replace('|', '') \
+				.replace(':', '.')) + ext
+			with self.timer.stage('file write'):
+				save_skin_weights(weights, path / name)
+			self.export_count += 1
+			self.reporter.step()
@@ -0,0 +1,167 @@
+#=================================================
+# external imports
+#=================================================
+
+import mmap
+import struct
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.util.buffers import view
+from lava.util.buffers import write_array
+
+#=================================================
+# constants
+#=================================================
+
+# Binary layout shared by point caches, channel files and skeletons, all
+# little-endian:
+#   header      magic, version, flags, item count, frame count, byte offset
+#               of the first frame and sample rate (frames per second)
+#   records     the format's own description of its items, zero-padded so
+#               the frame list starts on 8 bytes
+#   frame list  float64[frame count], the frame number of each sample
+#   frames      one row of item count * stride values per frame, starting at
+#               the first frame offset
+HEADER = struct.Struct('<4sHHIIQd')
+NAME = struct.Struct('<H')
+
+#=================================================
+# classes
+#=================================================
+
+class FramedWriter(object):
+	"""
+	Writes a row of values per frame, for a fixed set of items and a known
+	list of frames. If fewer frames than planned get written (e.g. the export
+	was aborted), close() shrinks the header's frame count to match, so the
+	file stays readable.
+
+	Formats set magic, version, the typecode of the rows, the stride (values
+	per item) and the unit items are named by in errors, and pass their
+	records in.
+	"""
+
+	magic = None
+	version = 1
+	typecode = 'f'
+	stride = 1
+	unit = 'items'
+
+	def __init__(self, path, count, records, frames, sample_rate, flags=0):
+		self.count, self.frames = count, list(frames)
+		self.sample_rate, self.flags = sample_rate, flags
+		self.written = 0
+		self.f = open(path, 'wb')
+		records += b'\0' * (-(HEADER.size + len(records)) % 8)
+		self.data_offset = HEADER.size + len(records) + 8 * len(self.frames)
+		self._write_header(len(self.frames))
+		self.f.write(records)
+		write_array(self.f, 'd', self.frames)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def _write_header(self, frame_count):
+		self.f.write(HEADER.pack(self.magic, self.version, self.flags,
+			self.count, frame_count, self.data_offset, self.sample_rate))
+
+	def write(self, values):
+		"""
+		Appends the next frame's row, stride values per item.
+		"""
+		if len(values) != self.count * self.stride:
+			raise ValueError('Expected %d %s, got %d.' % \
+				(self.count, self.unit, len(values) // self.stride))
+		if self.written == len(self.frames):
+			raise ValueError('All %d frames have been written.' % self.written)
+		write_array(self.f, self.typecode, values)
+		self.written += 1
+
+	def close(self):
+		if self.f.closed:
+			return
+		if self.written < len(self.frames):
+			self.f.seek(0)
+			self._write_header(self.written)
+		self.f.close()
+
+class FramedReader(object):
+	"""
+	Reads a framed file through a memory map. Any frame's row can be fetched
+	by offset, as a view into the map, without parsing the rest of the file.
+
+	Formats set magic, version, typecode, stride and the kind of file named
+	in errors, and parse their records in read_records.
+	"""
+
+	magic = None
+	version = 1
+	typecode = 'f'
+	stride = 1
+	kind = 'framed'
+
+	def __init__(self, path):
+		with open(path, 'rb') as f:
+			self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, version, self.flags, self.count, frame_count, \
+			self.data_offset, self.sample_rate = \
+			HEADER.unpack_from(self.buffer, 0)
+		if magic != self.magic or version > self.version:
+			raise ValueError('Not a %s file: %s.' % (self.kind, path))
+		offset = self.read_records(HEADER.size)
+		offset += -offset % 8
+		self.frames = list(view(self.buffer, offset, 'd', frame_count))
+
+	def read_records(self, offset):
+		"""
+		Parses the records starting at offset and returns where they end.
+		"""
+		return offset
+
+	def __len__(self):
+		return len(self.frames)
+
+	def frame(self, i):
+		"""
+		Returns the ith frame's row, stride values per item.
+		"""
+		if not 0 <= i < len(self.frames):
+			raise IndexError('Frame index out of range: %d.' % i)
+		size = self.count * self.stride
+		offset = size * struct.calcsize('<' + self.typecode) * i
+		return view(self.buffer, self.data_offset + offset, self.typecode, size)
+
+	def rows(self):
+		"""
+		Returns every frame's row, one after another, in one view.
+		"""
+		return view(self.buffer, self.data_offset, self.typecode,
+			len(self.frames) * self.count * self.stride)
+
+	def close(self):
+		self.buffer.close()
+
+#=================================================
+# functions
+#=================================================
+
+def pack_name(name):
+	"""
+	Returns a name as a record: a uint16 byte length followed by utf-8 bytes.
+	"""
+	name = str(name).encode('utf-8')
+	return NAME.pack(len(name)) + name
+
+def unpack_name(buffer, offset):
+	"""
+	Returns the name packed at offset and the offset after it.
+	"""
+	size = NAME.unpack_from(buffer, offset)[0]
+	offset += NAME.size
+	return buffer[offset:offset + size].decode('utf-8'), offset + size
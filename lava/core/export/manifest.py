@@ -0,0 +1,157 @@
+#=================================================
+# external imports
+#=================================================
+
+import hashlib
+import json
+import os
+from array import array
+
+#=================================================
+# constants
+#=================================================
+
+VERSION = 1
+EXT = '.manifest.json'
+
+#=================================================
+# classes
+#=================================================
+
+class Manifest(object):
+	"""
+	A JSON record of the files an export run produced, one entry per output
+	file, with its frame number, content hash, byte size and point bounds
+	(min x, y, z, max x, y, z). A compressed file's entry also names its
+	"compression" codec and its "raw_size" before compression. An entry whose
+	"reference" is set wasn't written because its content matched an earlier
+	file: readers should load the referenced file instead (or, if "hardlink"
+	is set, the file is a hard link to it).
+	"""
+
+	def __init__(self, path):
+		self.path = path
+		self.entries = []
+		self._hashes, self._names = {}, {}
+
+	def __len__(self):
+		return len(self.entries)
+
+	def __iter__(self):
+		return iter(self.entries)
+
+	def add(self, name, hash, frame=None, reference=None, hardlink=False,
+		size=None, bounds=None):
+		entry = dict(name=str(name), hash=hash, frame=frame, size=size,
+			bounds=bounds and list(bounds) or None)
+		if reference:
+			entry.update(reference=str(reference), hardlink=hardlink)
+		return self.keep(entry)
+
+	def keep(self, entry):
+		"""
+		Adds an existing entry, e.g. one carried over from an earlier run.
+		"""
+		if not entry.get('reference'):
+			self._hashes.setdefault(entry['hash'], entry)
+		self._names[entry['name']] = entry
+		self.entries.append(entry)
+		return entry
+
+	def get(self, name):
+		return self._names.get(str(name))
+
+	def current(self, name, hash, directory, source=None):
+		"""
+		Returns the entry for name if an earlier run left it up to date: same
+		content hash and, for a file on disk, still there at its recorded size;
+		for a reference, still pointing at source, the entry that now holds
+		the same content.
+		"""
+		entry = self.get(name)
+		if not entry or entry['hash'] != hash:
+			return None
+		if entry.get('reference') and not entry.get('hardlink'):
+			if source and source['name'] == entry['reference']:
+				return entry
+			return None
+		target = os.path.join(directory, entry['name'])
+		if os.path.exists(target) and os.path.getsize(target) == entry['size']:
+			return entry
+		return None
+
+	def merge(self, other):
+		"""
+		Carries over the entries of another manifest for files this one
+		doesn't list, e.g. frames an aborted update never reached.
+		"""
+		for entry in other:
+			if entry['name'] not in self._names:
+				self.keep(entry)
+
+	def find(self, hash):
+		"""
+		Returns the first written (not referenced) entry with the given content
+		hash, if any.
+		"""
+		return self._hashes.get(hash)
+
+	def save(self):
+		with open(self.path, 'w') as f:
+			json.dump(dict(version=VERSION, entries=self.entries), f, indent=1)
+
+	@classmethod
+	def load(cls, path):
+		manifest = cls(path)
+		with open(path) as f:
+			data = json.load(f)
+		for entry in data['entries']:
+			manifest.keep(entry)
+		return manifest
+
+#=================================================
+# functions
+#=================================================
+
+def hash_buffers(buffers, key=''):
+	"""
+	Returns a hex digest of the content of a sequence of numeric buffers,
+	such as the point arrays of every mesh in a frame, salted with a key
+	(e.g. the mesh names) so that different meshes don't collide.
+	"""
+	h = hashlib.sha1(key.encode('utf-8'))
+	for b in buffers:
+		try:
+			h.update(b)  # Arrays, numpy arrays and memoryviews as they are.
+		except TypeError:
+			h.update(array('d', b))
+	return h.hexdigest()
+
+def point_bounds(buffers):
+	"""
+	Returns the (min x, y, z, max x, y, z) bounds of a sequence of flat x, y, z
+	point buffers, or None if there are no points.
+	"""
+	buffers, lo, hi = [b for b in buffers if len(b)], [], []
+	for axis in range(3):
+		values = [b[axis::3] for b in buffers]
+		if not values:
+			return None
+		lo.append(min(min(v) for v in values))
+		hi.append(max(max(v) for v in values))
+	return lo + hi
+
+def link(source, target):
+	"""
+	Hard links target to source, returning False where the platform or file
+	system doesn't support it.
+	"""
+	if not hasattr(os, 'link'):
+		return False
+	try:
+		if os.path.exists(target):
+			os.remove(target)
+		os.link(source, target)
+	except OSError:
+		return False
+	return True
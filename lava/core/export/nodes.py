@@ -0,0 +1,98 @@
+#=================================================
+# external imports
+#=================================================
+
+from maya import cmds as mc
+from maya import OpenMaya as om
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.util.pointbuffer import PointBuffer
+
+#=================================================
+# functions
+#=================================================
+
+def depend_node(node):
+	"""
+	Returns the MObject of a node, by name.
+	"""
+	sel = om.MSelectionList()
+	sel.add(str(node))
+	obj = om.MObject()
+	sel.getDependNode(0, obj)
+	return obj
+
+def dag_path(node):
+	"""
+	Returns the MDagPath of a DAG node, by name.
+	"""
+	sel = om.MSelectionList()
+	sel.add(str(node))
+	path = om.MDagPath()
+	sel.getDagPath(0, path)
+	return path
+
+def mesh_path(mesh):
+	"""
+	Returns the MDagPath of a mesh shape, or of the first non-intermediate
+	mesh shape under a transform.
+	"""
+	shapes = mc.ls(str(mesh), dagObjects=True, type='mesh',
+		noIntermediate=True, long=True)
+	if not shapes:
+		raise ValueError('%s is not a mesh.' % mesh)
+	return dag_path(shapes[0])
+
+def time_context(frame):
+	"""
+	Returns a DG context that evaluates at a frame, in the scene's time unit,
+	without changing the current time.
+	"""
+	return om.MDGContext(om.MTime(frame, om.MTime.uiUnit()))
+
+def mesh_buffer(path, space=om.MSpace.kObject, frame=None):
+	"""
+	Returns a PointBuffer over a mesh, given its MDagPath, and the space to
+	read it in. At a frame, it's over the mesh's output evaluated in a DG
+	context, already in the requested space, so the scene's time never moves.
+	"""
+	if frame is None:
+		return PointBuffer(path), space
+	node = om.MFnDependencyNode(path.node())
+	if space == om.MSpace.kWorld:
+		plug = node.findPlug('worldMesh').elementByLogicalIndex(
+			path.instanceNumber())
+	else:
+		plug = node.findPlug('outMesh')
+	return PointBuffer(plug.asMObject(time_context(frame))), om.MSpace.kObject
+
+def read_points(path, space=om.MSpace.kObject, frame=None):
+	"""
+	Reads every vertex position of a mesh, given its MDagPath, in bulk, as a
+	flat x, y, z float32 array. Given a frame, the mesh is evaluated at it
+	instead of at the current time.
+	"""
+	buffer, space = mesh_buffer(path, space, frame)
+	return buffer.points(space, frame is None)
+
+def read_normals(path, space=om.MSpace.kObject, frame=None):
+	"""
+	Reads every normal of a mesh, given its MDagPath, in bulk, as a flat x,
+	y, z float32 array indexed by normal id, at the current time or a frame.
+	"""
+	buffer, space = mesh_buffer(path, space, frame)
+	return buffer.normals(space, frame is None)
+
+def read_mesh(path, space=om.MSpace.kObject, frame=None, normals=True):
+	"""
+	Reads the points and, unless normals is False, the normals of a mesh as
+	read_points and read_normals do, evaluating it only once at a frame.
+	"""
+	buffer, space = mesh_buffer(path, space, frame)
+	if not normals:
+		return buffer.points(space, frame is None), None
+	return buffer.points(space, frame is None), \
+		buffer.normals(space, frame is None)
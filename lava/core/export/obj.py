@@ -0,0 +1,122 @@
+#=================================================
+# external imports
+#=================================================
+
+from maya import OpenMaya as om
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.nodes import mesh_path
+from lava.core.export.nodes import read_mesh
+from lava.util.compression import CompressedWriter
+
+#=================================================
+# classes
+#=================================================
+
+class ObjWriter(object):
+	"""
+	Writes a fixed set of meshes to OBJ files, frame after frame. Faces, UVs
+	and normal ids don't change over an animation, so they are read and
+	formatted once, up front; each frame only reads the points (and normals)
+	in bulk and writes them ahead of the cached blocks.
+	"""
+
+	def __init__(self, meshes, groups=True, normals=True):
+		self.groups, self.normals = groups, normals
+		self.meshes = []
+		v_offset = vt_offset = vn_offset = 1
+		for mesh in meshes:
+			path = mesh_path(mesh)
+			uvs, faces, counts = self._read_topology(path, v_offset,
+				vt_offset, vn_offset)
+			self.meshes.append((path, uvs, faces))
+			v_offset += counts[0]
+			vt_offset += counts[1]
+			vn_offset += counts[2]
+
+	def _read_topology(self, path, v_offset, vt_offset, vn_offset):
+		fn = om.MFnMesh(path)
+		poly_counts, connects = om.MIntArray(), om.MIntArray()
+		fn.getVertices(poly_counts, connects)
+		u, v = om.MFloatArray(), om.MFloatArray()
+		fn.getUVs(u, v)
+		uv_counts, uv_ids = om.MIntArray(), om.MIntArray()
+		fn.getAssignedUVs(uv_counts, uv_ids)
+		normal_counts, normal_ids = om.MIntArray(), om.MIntArray()
+		fn.getNormalIds(normal_counts, normal_ids)
+
+		uv_count = u.length()
+		uvs = ('vt %f %f\n' * uv_count) % tuple(x for i in range(uv_count) \
+			for x in (u[i], v[i]))
+
+		# Bake the final, file-wide indices into the face block.
+		lines = []
+		if self.groups:
+			transform = om.MFnDagNode(path).parent(0)
+			name = om.MFnDependencyNode(transform).name()
+			lines.append('g %s\n' % name.replace(':', '_'))
+		corner = uv_corner = 0
+		for f in range(poly_counts.length()):
+			count = poly_counts[f]
+			has_uvs = uv_counts[f] == count
+			indices = []
+			for c in range(corner, corner + count):
+				index = str(connects[c] + v_offset)
+				if has_uvs:
+					index += '/%d' % (uv_ids[uv_corner + c - corner] + vt_offset)
+				if self.normals:
+					index += (has_uvs and '/%d' or '//%d') % \
+						(normal_ids[c] + vn_offset)
+				indices.append(index)
+			lines.append('f %s\n' % ' '.join(indices))
+			corner += count
+			if has_uvs:
+				uv_corner += count
+
+		return uvs, ''.join(lines), (fn.numVertices(), uv_count,
+			fn.numNormals())
+
+	def paths(self):
+		return [path for path, uvs, faces in self.meshes]
+
+	def sample(self, frame=None):
+		"""
+		Reads the world-space points and normals of every mesh, in bulk, at
+		the current time or at a frame, and returns them as that frame's
+		payload for write. Each mesh is evaluated once for both.
+		"""
+		space = om.MSpace.kWorld
+		return [read_mesh(path, space, frame, self.normals) \
+			for path, uvs, faces in self.meshes]
+
+	def write(self, f, payload=None):
+		"""
+		Writes one OBJ to an open file, from a payload returned by sample, or
+		from the current points if none is given.
+		"""
+		if payload is None:
+			payload = self.sample()
+		f.write('# Lava OBJ export\n')
+		for (path, uvs, faces), (points, normals) in zip(self.meshes, payload):
+			f.write(('v %f %f %f\n' * (len(points) // 3)) % tuple(points))
+			f.write(uvs)
+			if normals is not None:
+				f.write(('vn %f %f %f\n' * (len(normals) // 3)) % \
+					tuple(normals))
+			f.write(faces)
+
+	def save(self, path, payload=None, compression=None, level=None):
+		"""
+		Writes one OBJ file, compressed as it's written if a codec is given,
+		in which case the uncompressed size is returned.
+		"""
+		if not compression:
+			with open(path, 'w') as f:
+				self.write(f, payload)
+			return None
+		with CompressedWriter(path, compression, level) as f:
+			self.write(f, payload)
+		return f.size
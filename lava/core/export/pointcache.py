@@ -0,0 +1,71 @@
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.framed import FramedReader
+from lava.core.export.framed import FramedWriter
+from lava.core.export.framed import pack_name
+from lava.core.export.framed import unpack_name
+
+#=================================================
+# constants
+#=================================================
+
+# Binary layout (see lava.core.export.framed), all little-endian:
+#   header      magic, version, flags, vertex count, frame count, byte offset
+#               of the first frame and sample rate (frames per second)
+#   name        the mesh name, as a uint16 byte length followed by utf-8
+#               bytes, zero-padded to 8 bytes
+#   frame list  float64[frame count], the frame number of each sample
+#   frames      float32[frame count][vertex count * 3], one contiguous block
+#               of x, y, z points per frame, starting at the first frame offset
+MAGIC = b'LPTC'
+VERSION = 1
+EXT = '.lpc'
+
+#=================================================
+# classes
+#=================================================
+
+class PointCacheWriter(FramedWriter):
+	"""
+	Writes one mesh's points for a known list of frames to a single point
+	cache file, a frame at a time. If fewer frames than planned get written
+	(e.g. the export was aborted), close() shrinks the header's frame count
+	to match, so the file stays readable.
+	"""
+
+	magic = MAGIC
+	version = VERSION
+	stride = 3
+	unit = 'points'
+
+	def __init__(self, path, name, vertex_count, frames, sample_rate):
+		self.vertex_count = vertex_count
+		FramedWriter.__init__(self, path, vertex_count, pack_name(name),
+			frames, sample_rate)
+
+class PointCache(FramedReader):
+	"""
+	Reads a point cache file through a memory map. Any frame can be fetched
+	by offset, as a float32 view into the map, without parsing the rest of
+	the file.
+	"""
+
+	magic = MAGIC
+	version = VERSION
+	stride = 3
+	kind = 'point cache'
+
+	def read_records(self, offset):
+		self.vertex_count = self.count
+		self.name, offset = unpack_name(self.buffer, offset)
+		return offset
+
+	def at(self, frame):
+		"""
+		Returns the points of the sample nearest to a frame number.
+		"""
+		nearest = min(range(len(self.frames)),
+			key=lambda i: abs(self.frames[i] - frame))
+		return self.frame(nearest)
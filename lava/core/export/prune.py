@@ -0,0 +1,62 @@
+#=================================================
+# external imports
+#=================================================
+
+from maya import cmds as mc
+
+#=================================================
+# functions
+#=================================================
+
+def ancestors(name):
+	"""
+	Returns the long names of a DAG node's parents, given its long name,
+	top-most first.
+	"""
+	parts = name.split('|')
+	return ['|'.join(parts[:i]) for i in range(2, len(parts))]
+
+def upstream(roots):
+	"""
+	Returns the long names of every node the roots depend on, the roots
+	included: whatever feeds them through incoming connections, their DAG
+	parents (which move them) and, in turn, what those depend on. The walk
+	goes a wave at a time, with one listConnections call per wave however
+	many nodes it holds, and hashed sets to skip what's been seen.
+	"""
+	seen, wave = set(), mc.ls(roots, long=True) or []
+	while wave:
+		new = []
+		for name in wave:
+			for n in [name] + ancestors(name):
+				if n not in seen:
+					seen.add(n)
+					new.append(n)
+		if not new:
+			break
+		sources = mc.listConnections(new, source=True, destination=False,
+			skipConversionNodes=False)
+
+		# An empty ls would list the whole scene.
+		wave = sources and mc.ls(list(set(sources)), long=True) or []
+	return seen
+
+def prune(roots):
+	"""
+	Deletes every DAG node the roots and their descendants don't depend on,
+	in one batched delete, and returns how many nodes went. Only the
+	top-most of the nodes to delete are named, since their children go
+	with them.
+	"""
+	roots = mc.ls(roots, long=True) or []
+	if not roots:
+		return 0
+	keep = upstream(roots + (mc.listRelatives(roots, allDescendents=True,
+		fullPath=True) or []))
+	keep.update(mc.ls(undeletable=True, long=True) or [])
+	doomed = [n for n in mc.ls(dag=True, long=True) or [] if n not in keep]
+	lookup = set(doomed)
+	top = [n for n in doomed if not any(a in lookup for a in ancestors(n))]
+	if top:
+		mc.delete(top)
+	return len(doomed)
@@ -0,0 +1,56 @@
+#=================================================
+# external imports
+#=================================================
+
+from maya import cmds as mc
+
+#=================================================
+# functions
+#=================================================
+
+def skinned_geometry():
+	"""
+	Returns the long names of every shape a skin cluster deforms, directly
+	or through whatever is stacked after it, found from the skin clusters'
+	output connections a layer at a time instead of by searching each
+	shape's history. The walk goes on through any node outside the DAG
+	(deformers, groupParts, tweaks) and stops at shapes and sets.
+	"""
+	shapes = set()
+	seen = set(mc.ls(type='skinCluster') or [])
+	outputs = seen and mc.listConnections(
+		['%s.outputGeometry' % n for n in seen],
+		source=False, destination=True, shapes=True) or []
+	while outputs:
+		outputs = list(set(outputs))
+		shapes.update(mc.ls(outputs, shapes=True, long=True) or [])
+		stops = set(mc.ls(outputs, type=['dagNode', 'objectSet']) or [])
+		nodes = [n for n in outputs if n not in stops and n not in seen]
+		seen.update(nodes)
+		outputs = nodes and mc.listConnections(nodes, source=False,
+			destination=True, shapes=True) or []
+	return shapes
+
+def classify(nodes=None):
+	"""
+	Counts the joint chains, cameras, meshes without a skin and skinned
+	meshes at and under nodes, or the selection, in the order of the export
+	types, from a single listing of their DAG.
+	"""
+	kwargs = dict(dagObjects=True, noIntermediate=True, long=True,
+		showType=True)
+	if nodes is None:
+		listing = mc.ls(selection=True, **kwargs) or []
+	elif not nodes:
+		# An empty ls would list the whole scene.
+		listing = []
+	else:
+		listing = mc.ls([str(n) for n in nodes], **kwargs) or []
+	joints, cameras, meshes = set(), set(), set()
+	kinds = dict(joint=joints, camera=cameras, mesh=meshes)
+	for name, type in zip(listing[::2], listing[1::2]):
+		if type in kinds:
+			kinds[type].add(name)
+	roots = len([j for j in joints if j.rsplit('|', 1)[0] not in joints])
+	skins = meshes and len(meshes & skinned_geometry()) or 0
+	return roots, len(cameras), len(meshes) - skins, skins
@@ -0,0 +1,211 @@
+#=================================================
+# external imports
+#=================================================
+
+import re
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.channels import EXT as CHANNELS_EXT
+from lava.core.export.manifest import EXT as MANIFEST_EXT
+from lava.util.timers import EXT as TIMINGS_EXT
+
+#=================================================
+# constants
+#=================================================
+
+TYPES = ('skeleton', 'camera', 'mesh', 'skin')
+EXTENSIONS = ('.lsk', '.ma', '.obj', '.xml')
+NODE_NAMES = ('joint chain', 'camera', 'mesh', 'skin')
+
+# What to do with a frame whose content matches an earlier frame's file.
+HELD_FRAMES = ('write', 'reference', 'link')
+
+# Channel streams that can be sampled in the same pass as a mesh export.
+STREAMS = ('camera', 'joint')
+
+NAME_PAT = re.compile('(%s)')
+FRAME_PAT = re.compile('(%[\d\.]*(?:f|d))')
+SPLIT_PAT = re.compile('((?:%s|%[\d\.]*(?:d|f)))')
+
+#=================================================
+# classes
+#=================================================
+
+class ExportSettings(object):
+	"""
+	Everything an export run needs to know, independent of any UI. Keyword
+	arguments override the defaults below.
+	"""
+
+	def __init__(self, **kwargs):
+		self.type = 'mesh'
+		self.path = ''
+		self.format = ''
+		self.ext = '.obj'
+		self.start, self.end, self.by = 1.0, 1.0, 1.0
+		self.renum_start = self.renum_by = None  # None keeps the frame numbers.
+		self.animation = True
+		self.one_file = False  # Every frame in one file, instead of per frame.
+		self.one_file_per_node = False
+		self.point_cache = False
+		self.native_obj = True
+		self.obj_options = dict(groups=True, ptgroups=False, materials=False,
+			smoothing=False, normals=True)
+		self.held_frames = 'write'
+		self.update_existing = False
+		self.manifest_part = None  # Set on each shard of a sharded export.
+		self.context_sampling = True  # Evaluate without changing the time.
+		self.suspend_refresh = False
+		self.streams = []
+		self.write_threads = 2  # 0 writes files on Maya's main thread.
+		self.write_queue_size = 8
+		self.compression = None  # 'gzip', or 'zstd' where available.
+		self.compression_level = None  # None picks the codec's default.
+		self.timings = True  # Save a report of where the time went.
+		self.overwrite = False
+		self.shape_attributes = []
+		self.transform_attributes = []
+		self.create_stand_in = False  # Cameras in world space.
+		self.optimize = True
+		self.bake_cameras = False  # Bake and export from the scene.
+		self.camera_ma = True  # With a Maya ASCII file from the samples.
+		self.world_joints = False  # Joints in world space, not their parents'.
+		for k, v in kwargs.items():
+			if not hasattr(self, k):
+				raise TypeError('Unknown export setting: %s.' % k)
+			setattr(self, k, v)
+
+	@property
+	def by_node(self):
+		# Point caches hold every frame of one mesh in a single file.
+		return self.one_file_per_node or self.point_cache
+
+	@property
+	def by_frame(self):
+		return self.animation and not self.point_cache
+
+	def frames(self):
+		"""
+		Yields each (frame, renumbered frame) pair of the range.
+		"""
+		start, end, by = self.start, self.end, self.by
+		renum_frame, renum_by = self.renum_start, self.renum_by
+		if renum_frame is None:
+			renum_frame, renum_by = start, by
+		frame = start
+		while (by > 0 and frame <= end) or (by < 0 and frame >= end):
+			yield frame, renum_frame
+			frame += by
+			renum_frame += renum_by
+
+#=================================================
+# functions
+#=================================================
+
+def named_format(format):
+	"""
+	Turns the %s and %d (or %f) of a file name format into named
+	%(name)s and %(frame)d fields.
+	"""
+	format = NAME_PAT.sub(lambda m: '%(name)' + m.group(1)[1:], format)
+	return FRAME_PAT.sub(lambda m: '%(frame)' + m.group(1)[1:], format)
+
+def manifest_name(format, part=None):
+	"""
+	Returns the file name of an export's manifest or, given a part number,
+	of the partial manifest one shard of a sharded export writes.
+	"""
+	name = base_name(format)
+	if part is not None:
+		name += '.part%03d' % part
+	return name + MANIFEST_EXT
+
+def timings_name(format, part=None):
+	"""
+	Returns the file name of an export's stage timing report, or of one
+	shard's.
+	"""
+	name = base_name(format)
+	if part is not None:
+		name += '.part%03d' % part
+	return name + TIMINGS_EXT
+
+def stream_name(format, stream, ext=CHANNELS_EXT):
+	"""
+	Returns the name of a file an extra stream is sampled into, by default
+	its channel file.
+	"""
+	return '%s.%s%s' % (base_name(format), stream, ext)
+
+def base_name(format):
+	"""
+	Returns what's left of a name format without its name and frame fields.
+	"""
+	name = NAME_PAT.sub('', format)
+	return FRAME_PAT.sub('', name).replace('..', '.').strip('.') or 'export'
+
+def total_frames(start, end, by):
+	return int((end - start) / by + by)
+
+def fix_format(settings, ignore_scene=False):
+	"""
+	Returns a Python string format based on the settings' name format and
+	the total number of frames that will be exported.
+	"""
+
+	s = settings
+	renum = s.renum_start is not None
+
+	# Determine whether to use float values for the string format.
+	boxes = renum and (s.renum_start, s.renum_by) or (s.start, s.by)
+	is_float = True in [x != int(x) for x in boxes]
+	dorf = is_float and '.2f' or 'd'
+
+	# Figure out how much padding to use.
+	padding = len(str(total_frames(s.start, s.end, s.by)))
+	if is_float:
+		padding += 3  # Decimal + 2 precision slots count as padding.
+
+	# Break-up the format into segments and replace any existing string
+	# formats with the new one.
+	format = s.format
+	if not s.by_node:
+		format = NAME_PAT.sub('', format)
+	if not s.by_frame:
+		format = FRAME_PAT.sub('', format)
+	segs = [seg for seg in SPLIT_PAT.split(format) if seg]
+	frame = [seg for seg in segs if FRAME_PAT.match(seg)]
+
+	if not ignore_scene:
+		if s.by_node:
+			if '%s' not in segs:
+				if frame:
+					i = segs.index(frame[0])
+					segs.insert(i, '.')
+					segs.insert(i, '%s')
+					segs.insert(i, '.')
+				elif not segs:
+					segs.append('%s')
+				else:
+					segs.extend(['.', '%s'])
+		elif not segs:
+			segs.append('geo')
+		if s.by_frame:
+			if not frame:
+				segs.extend(['.', '%d'])
+			for i, seg in enumerate(segs):
+				if FRAME_PAT.match(seg):
+					segs[i] = '%%0%d' % padding + dorf
+
+	# Put all the pieces back together.
+	format = ''.join(segs).replace('..', '.')
+	if format.startswith('.'):
+		format = format[1:]
+	if format.endswith('.obj'):
+		format = format[:-4]
+	if format.endswith('.'):
+		format = format[:-1]
+	return format
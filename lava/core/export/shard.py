@@ -0,0 +1,116 @@
+"""
+Splits a batch mesh export's frame range into chunks and exports each
+chunk in its own mayapy process, a pool of them at a time, then merges the
+chunks' partial manifests into one. Nothing here needs Maya itself.
+"""
+
+#=================================================
+# external imports
+#=================================================
+
+import os
+import subprocess
+import sys
+from multiprocessing.pool import ThreadPool
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.manifest import Manifest
+from lava.core.export.settings import manifest_name
+
+#=================================================
+# constants
+#=================================================
+
+BATCH_MODULE = 'lava.core.export.batch'
+
+#=================================================
+# functions
+#=================================================
+
+def chunks(frames, count, size=None):
+	"""
+	Splits a list of (frame, renumbered frame) pairs into contiguous chunks,
+	count of them or, if given, of size frames each.
+	"""
+	if not size:
+		size = max(1, -(-len(frames) // max(1, count)))
+	return [frames[i:i + size] for i in range(0, len(frames), size)]
+
+def shard_args(args, chunk, part, settings):
+	"""
+	Returns the batch arguments that export one chunk of frames: the run's
+	own arguments, overridden by the chunk's range and renumbering. The
+	format is passed as the whole run made it, so the padding doesn't vary
+	between chunks.
+	"""
+
+	# End half a step past the last frame, so float steps that add up a
+	# little differently in the shard don't drop it.
+	first, renum_first = chunk[0]
+	args = list(args) + ['--start', repr(first),
+		'--end', repr(chunk[-1][0] + settings.by / 2.0),
+		'--format', settings.format, '--manifest-part', str(part),
+		'--jobs', '1']
+	if settings.renum_start is not None:
+		args += ['--renum-start', repr(renum_first),
+			'--renum-by', repr(settings.renum_by)]
+	return args
+
+def run_shard(args):
+	"""
+	Runs one shard to completion, returning its exit code and output.
+	"""
+	process = subprocess.Popen([sys.executable, '-m', BATCH_MODULE] + args,
+		stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+	output = process.communicate()[0]
+	return process.returncode, output.decode('utf-8', 'replace')
+
+def merge_manifests(settings, parts):
+	"""
+	Merges the partial manifests of a sharded export, in frame order, into
+	the run's manifest, removing them. Entries of the previous run's manifest
+	for frames no shard reached are carried over when updating.
+	"""
+	path = os.path.join(settings.path, manifest_name(settings.format))
+	previous = None
+	if settings.update_existing and os.path.exists(path):
+		previous = Manifest.load(path)
+	manifest = Manifest(path)
+	for part in range(parts):
+		part_path = os.path.join(settings.path,
+			manifest_name(settings.format, part))
+		if os.path.exists(part_path):
+			manifest.merge(Manifest.load(part_path))
+			os.remove(part_path)
+	if previous is not None:
+		manifest.merge(previous)
+	manifest.save()
+	return manifest
+
+def export_sharded(args, settings, jobs, chunk_size=None, out=sys.stdout):
+	"""
+	Exports the frames of settings in chunks, running up to jobs batch
+	processes at once, and returns the number of chunks that failed.
+	"""
+	parts = chunks(list(settings.frames()), jobs, chunk_size)
+	out.write('Exporting %d frames in %d chunks, %d at a time...\n' % \
+		(sum(len(c) for c in parts), len(parts), jobs))
+	pool = ThreadPool(min(jobs, len(parts)) or 1)
+	try:
+		results = pool.map(run_shard, [shard_args(args, c, i, settings) \
+			for i, c in enumerate(parts)])
+	finally:
+		pool.close()
+	failed = 0
+	for i, (code, output) in enumerate(results):
+		for line in output.splitlines():
+			out.write('[%d] %s\n' % (i, line))
+		if code:
+			failed += 1
+	manifest = merge_manifests(settings, len(parts))
+	out.write('%d of %d chunks succeeded; the manifest lists %d files.\n' % \
+		(len(parts) - failed, len(parts), len(manifest)))
+	return failed
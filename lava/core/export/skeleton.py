@@ -0,0 +1,172 @@
+#=================================================
+# external imports
+#=================================================
+
+import math
+import struct
+
+from maya import OpenMaya as om
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.framed import FramedReader
+from lava.core.export.framed import FramedWriter
+from lava.core.export.framed import pack_name
+from lava.core.export.framed import unpack_name
+from lava.core.export.nodes import dag_path
+from lava.core.export.nodes import depend_node
+from lava.core.export.nodes import time_context
+from lava.core.export.timeline import Stream
+
+#=================================================
+# constants
+#=================================================
+
+# Binary layout (see lava.core.export.framed), all little-endian:
+#   header      magic, version, flags, joint count, frame count, byte offset
+#               of the first frame and sample rate (frames per second)
+#   joints      each joint's parent index (int32, -1 for a root) and name, as
+#               a uint16 byte length followed by utf-8 bytes, zero-padded to 8
+#               bytes in all; a parent always comes before its children
+#   frame list  float64[frame count], the frame number of each sample
+#   frames      float32[frame count][joint count][10], each joint's translate
+#               (x, y, z), rotation quaternion (x, y, z, w) and scale (x, y,
+#               z) per frame, starting at the first frame offset
+MAGIC = b'LSKL'
+VERSION = 1
+PARENT = struct.Struct('<i')
+EXT = '.lsk'
+WORLD = 1  # Flag: the transforms are in world space, not parent space.
+STRIDE = 10
+
+#=================================================
+# classes
+#=================================================
+
+class SkeletonWriter(FramedWriter):
+	"""
+	Writes the transforms of a fixed set of joints for a known list of
+	frames to a skeleton file, a frame at a time. As with point caches,
+	close() shrinks the frame count to what was written, so an aborted
+	export leaves a readable file.
+	"""
+
+	magic = MAGIC
+	version = VERSION
+	stride = STRIDE
+	unit = 'joints'
+
+	def __init__(self, path, names, parents, frames, sample_rate, world=False):
+		self.names, self.parents = [str(n) for n in names], list(parents)
+		records = b''.join(PARENT.pack(parent) + pack_name(name) \
+			for name, parent in zip(self.names, self.parents))
+		FramedWriter.__init__(self, path, len(self.names), records, frames,
+			sample_rate, world and WORLD or 0)
+
+class Skeleton(FramedReader):
+	"""
+	Reads a skeleton file through a memory map: a frame's transforms of
+	every joint or one joint's transform at a frame.
+	"""
+
+	magic = MAGIC
+	version = VERSION
+	stride = STRIDE
+	kind = 'skeleton'
+
+	def read_records(self, offset):
+		self.world = bool(self.flags & WORLD)
+		self.names, self.parents = [], []
+		for i in range(self.count):
+			self.parents.append(PARENT.unpack_from(self.buffer, offset)[0])
+			name, offset = unpack_name(self.buffer, offset + PARENT.size)
+			self.names.append(name)
+		return offset
+
+	def transform(self, i, name):
+		"""
+		Returns a joint's translate, quaternion and scale at the ith frame.
+		"""
+		j = self.names.index(name) * STRIDE
+		return tuple(self.frame(i)[j:j + STRIDE])
+
+class SkeletonStream(Stream):
+	"""
+	Samples the transforms of a set of joints every frame into a skeleton
+	file: each joint's matrix, in world space or relative to its parent, is
+	read off its matrix plug and decomposed into translate, quaternion and
+	scale. Every joint is read in the same DG context and the frame goes out
+	in one write, as one block of floats.
+
+	Joints are long names, parents before children.
+	"""
+
+	stage = 'joints'
+
+	def __init__(self, path, joints, frames, sample_rate, world=False):
+		self.path, self.joints = path, list(joints)
+		self.frames, self.sample_rate = list(frames), sample_rate
+		self.world = world
+		index = dict((j, i) for i, j in enumerate(self.joints))
+		self.parents = [index.get(j.rsplit('|', 1)[0], -1) \
+			for j in self.joints]
+		self.writer = None
+
+	def begin(self):
+		self.plugs = []
+		for joint in self.joints:
+			fn = om.MFnDependencyNode(depend_node(joint))
+			if self.world:
+				self.plugs.append(fn.findPlug('worldMatrix') \
+					.elementByLogicalIndex(dag_path(joint).instanceNumber()))
+			else:
+				self.plugs.append(fn.findPlug('matrix'))
+		self.rotations = [None] * len(self.joints)
+		self.writer = SkeletonWriter(self.path, self.joints, self.parents,
+			self.frames, self.sample_rate, self.world)
+
+	def sample(self, frame, renum_frame, time):
+		context = time is not None and time_context(time) or None
+		row = []
+		for i, plug in enumerate(self.plugs):
+			if context is None:
+				data = plug.asMObject()
+			else:
+				data = plug.asMObject(context)
+			row += self._decompose(i, om.MFnMatrixData(data).matrix())
+		self.writer.write(row)
+
+	def _decompose(self, i, matrix):
+		"""
+		Returns a joint's translate, quaternion and scale from its matrix,
+		with the quaternion kept in the same hemisphere as the last frame's,
+		so interpolating between them takes the short way round.
+		"""
+		xform = om.MTransformationMatrix(matrix)
+		t = xform.getTranslation(om.MSpace.kTransform)
+		q = xform.rotation()
+		q = [q.x, q.y, q.z, q.w]
+		last = self.rotations[i]
+		if last is not None and sum(a * b for a, b in zip(q, last)) < 0:
+			q = [-x for x in q]
+		self.rotations[i] = q
+		s = [math.sqrt(sum(matrix(r, c) ** 2 for c in range(3))) \
+			for r in range(3)]
+		return [t.x, t.y, t.z] + q + s
+
+	def end(self):
+		if self.writer is not None:
+			self.writer.close()
+
+#=================================================
+# functions
+#=================================================
+
+def joint_order(names):
+	"""
+	Returns the long names of joints without repeats, in depth-first order,
+	so every parent comes before its children.
+	"""
+	return sorted(set(names), key=lambda name: name.split('|'))
@@ -0,0 +1,499 @@
+#=================================================
+# external imports
+#=================================================
+
+import mmap
+import os
+import struct
+from array import array
+from xml.etree.ElementTree import ElementTree
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape
+
+from maya import cmds as mc
+from maya import OpenMaya as om
+from maya import OpenMayaAnim as oma
+from pymel.core.language import mel
+from pymel.core.system import undoInfo
+from pymel.internal.factories import ApiUndoItem
+from pymel.internal.factories import apiUndo
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.nodes import depend_node
+from lava.core.export.nodes import mesh_path
+from lava.core.export.nodes import read_points
+from lava.util.buffers import view
+from lava.util.buffers import write_array
+from lava.util.kdtree import KDTree
+
+#=================================================
+# constants
+#=================================================
+
+# Binary layout, all little-endian:
+#   header      magic, version, flags, vertex count, influence count and
+#               non-zero weight count
+#   names       the mesh name, then each influence name, as a uint16 byte
+#               length followed by utf-8 bytes, zero-padded to 4 bytes
+#   positions   float32[vertex count * 3]
+#   offsets     uint32[vertex count + 1], CSR row pointers
+#   values      float32[non-zero count], weights
+#   columns     uint16[non-zero count], influence indices
+BINARY_MAGIC = b'LSKW'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHIII')
+BINARY_NAME = struct.Struct('<H')
+BINARY_EXT = '.skw'
+FORMATS = ('.xml', BINARY_EXT)
+
+# Vertices per bulk set when streaming weights in.
+BATCH_SIZE = 4096
+
+#=================================================
+# classes
+#=================================================
+
+class SkinWeights(object):
+	"""
+	The weight table of a skin cluster, held in compressed sparse row (CSR)
+	arrays. The non-zero weights of vertex i live in
+	columns[offsets[i]:offsets[i + 1]] (influence indices) and the matching
+	slice of values (weights). Positions are flattened x, y, z triples.
+	"""
+
+	def __init__(self, name, influences, positions, offsets, columns, values):
+		self.name = name
+		self.influences = list(influences)
+		self.positions = positions
+		self.offsets = offsets
+		self.columns = columns
+		self.values = values
+
+	def __len__(self):
+		return len(self.offsets) - 1
+
+	def __iter__(self):
+		"""
+		Yields (vertex index, position, [(influence index, weight), ...]).
+		"""
+		for i in range(len(self)):
+			yield i, self.position(i), self.weights(i)
+
+	def position(self, i):
+		p = self.positions
+		return (p[i * 3], p[i * 3 + 1], p[i * 3 + 2])
+
+	def weights(self, i):
+		start, end = self.offsets[i], self.offsets[i + 1]
+		return list(zip(self.columns[start:end], self.values[start:end]))
+
+	def dense(self):
+		"""
+		Returns the weights as a flat vertex-major array of
+		len(self) * len(self.influences) doubles.
+		"""
+		stride = len(self.influences)
+		result = array('d', [0.0]) * (len(self) * stride)
+		offsets, columns, values = self.offsets, self.columns, self.values
+		for i in range(len(self)):
+			row = i * stride
+			for j in range(offsets[i], offsets[i + 1]):
+				result[row + columns[j]] = values[j]
+		return result
+
+	@classmethod
+	def from_dense(cls, name, influences, positions, dense, tolerance=0.0):
+		"""
+		Builds the sparse table from a flat vertex-major sequence of weights,
+		dropping any weight at or below the tolerance.
+		"""
+		stride = len(influences)
+		count = stride and len(dense) // stride or 0
+		offsets, columns, values = array('I', [0]), array('H'), array('d')
+		for i in range(count):
+			row = i * stride
+			for ii in range(stride):
+				w = dense[row + ii]
+				if w > tolerance:
+					columns.append(ii)
+					values.append(w)
+			offsets.append(len(values))
+		return cls(name, influences, positions, offsets, columns, values)
+
+	@classmethod
+	def from_rows(cls, name, influences, positions, rows):
+		"""
+		Builds the sparse table from one [(influence index, weight), ...]
+		list per vertex.
+		"""
+		offsets, columns, values = array('I', [0]), array('H'), array('d')
+		for row in rows:
+			for ii, w in row:
+				columns.append(ii)
+				values.append(w)
+			offsets.append(len(values))
+		return cls(name, influences, positions, offsets, columns, values)
+
+class _DoubleArrayView(object):
+	"""
+	Gives an MDoubleArray the len() and indexing that from_dense expects.
+	"""
+
+	def __init__(self, doubles):
+		self.doubles = doubles
+
+	def __len__(self):
+		return self.doubles.length()
+
+	def __getitem__(self, i):
+		return self.doubles[i]
+
+class SkinWeightSetter(object):
+	"""
+	Sets weights on a mesh's skin cluster in bulk, one
+	MFnSkinCluster.setWeights call per batch of vertices. Influences are
+	matched by name, normalization is deferred until close() and everything
+	set in between is undone as a single step.
+	"""
+
+	def __init__(self, mesh, skin_cluster=None):
+		self.skin_cluster = str(skin_cluster or find_skin_cluster(mesh) or '')
+		if not self.skin_cluster:
+			raise ValueError('No skin cluster found on %s.' % mesh)
+		self.fn = oma.MFnSkinCluster(depend_node(self.skin_cluster))
+		self.path = mesh_path(mesh)
+		self.count = om.MFnMesh(self.path).numVertices()
+
+		# Map influence names to the skin cluster's indices once.
+		paths = om.MDagPathArray()
+		self.fn.influenceObjects(paths)
+		self.indices, self.lookup = om.MIntArray(), {}
+		for i in range(paths.length()):
+			name = paths[i].partialPathName()
+			self.lookup[name] = self.lookup[name.split('|')[-1]] = i
+			self.indices.append(i)
+
+		# Hold off normalizing until everything has been set. The chunk is
+		# closed again if that fails, since close() won't be called.
+		self.normalize = mc.getAttr(self.skin_cluster + '.normalizeWeights')
+		undoInfo(openChunk=True)
+		try:
+			mc.setAttr(self.skin_cluster + '.normalizeWeights', 0)
+		except:
+			undoInfo(closeChunk=True)
+			raise
+		self.closed = False
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def check(self, influences):
+		missing = [n for n in influences if n not in self.lookup]
+		if missing:
+			raise ValueError('%s is not influenced by: %s.' % \
+				(self.skin_cluster, ', '.join(missing)))
+
+	def set(self, rows):
+		"""
+		Sets a batch of (vertex index, [(influence, weight), ...]) rows with one
+		API call. Influences missing from a row get a weight of zero.
+		"""
+
+		inf_count = self.indices.length()
+		values = om.MDoubleArray(len(rows) * inf_count, 0.0)
+		elements = om.MIntArray()
+		for r, (i, weights) in enumerate(rows):
+			if not 0 <= i < self.count:
+				raise ValueError('Vertex %d is out of range.' % i)
+			elements.append(i)
+			row = r * inf_count
+			for inf, w in weights:
+				if inf not in self.lookup:
+					self.check((inf,))
+				values.set(w, row + self.lookup[inf])
+		components = om.MFnSingleIndexedComponent()
+		vertices = components.create(om.MFn.kMeshVertComponent)
+		components.addElements(elements)
+
+		# Let PyMEL's API undo queue record the set inside the open chunk.
+		old_values = om.MDoubleArray()
+		self.fn.setWeights(self.path, vertices, self.indices, values, False,
+			old_values)
+		apiUndo.append(ApiUndoItem(self._set_weights, (vertices, values),
+			(vertices, old_values)))
+
+	def close(self):
+		if self.closed:
+			return
+		self.closed = True
+		try:
+			mc.setAttr(self.skin_cluster + '.normalizeWeights', self.normalize)
+			if self.normalize:
+				mc.skinPercent(self.skin_cluster, self.path.fullPathName(),
+					normalize=True)
+		finally:
+			undoInfo(closeChunk=True)
+
+	def _set_weights(self, vertices, values):
+		self.fn.setWeights(self.path, vertices, self.indices, values, False)
+
+#=================================================
+# functions
+#=================================================
+
+def find_skin_cluster(mesh):
+	"""
+	Returns the name of the skin cluster deforming the mesh, if any.
+	"""
+	return mel.findRelatedSkinCluster(mesh) or None
+
+def read_skin_weights(mesh, skin_cluster=None):
+	"""
+	Reads the entire weight table and the object-space vertex positions of a
+	skinned mesh with one bulk API call each, instead of one skinPercent query
+	per vertex and influence.
+	"""
+
+	skin_cluster = skin_cluster or find_skin_cluster(mesh)
+	if not skin_cluster:
+		raise ValueError('No skin cluster found on %s.' % mesh)
+	fn = oma.MFnSkinCluster(depend_node(skin_cluster))
+	path = mesh_path(mesh)
+	mesh_fn = om.MFnMesh(path)
+
+	# Influence names, in the skin cluster's physical index order.
+	paths = om.MDagPathArray()
+	fn.influenceObjects(paths)
+	influences = [paths[i].partialPathName() for i in range(paths.length())]
+
+	# All the weights of all the vertices in one call.
+	components = om.MFnSingleIndexedComponent()
+	vertices = components.create(om.MFn.kMeshVertComponent)
+	components.setCompleteData(mesh_fn.numVertices())
+	weights = om.MDoubleArray()
+	util = om.MScriptUtil()
+	util.createFromInt(0)
+	count_ptr = util.asUintPtr()
+	fn.getWeights(path, vertices, weights, count_ptr)
+	if om.MScriptUtil.getUint(count_ptr) != len(influences):
+		raise RuntimeError('Influence count mismatch on %s.' % skin_cluster)
+
+	return SkinWeights.from_dense(str(mesh), influences, read_points(path),
+		_DoubleArrayView(weights))
+
+def read_positions(mesh):
+	"""
+	Reads the object-space positions of every vertex in one API call, as a
+	flat x, y, z array.
+	"""
+	return read_points(mesh_path(mesh))
+
+def transfer_by_position(weights, positions, k=1):
+	"""
+	Maps a weight table onto another vertex layout, a flat x, y, z sequence
+	of positions, by matching positions instead of vertex indices. A k-d tree
+	over the stored positions finds each target vertex's nearest stored vertex
+	in O(log n); with k > 1 the weights of the k nearest are blended by
+	inverse distance and renormalized.
+	"""
+
+	tree = KDTree(weights.positions)
+	rows = []
+	for i in range(0, len(positions), 3):
+		nearest = tree.query(positions[i:i + 3], k)
+		if nearest[0][0] == 0.0 or len(nearest) == 1:
+			rows.append(weights.weights(nearest[0][1]))
+			continue
+		blend, total = {}, 0.0
+		for d, vi in nearest:
+			factor = 1.0 / d ** 0.5
+			total += factor
+			for ii, w in weights.weights(vi):
+				blend[ii] = blend.get(ii, 0.0) + w * factor
+		rows.append(sorted((ii, w / total) for ii, w in blend.items()))
+	return SkinWeights.from_rows(weights.name, weights.influences, positions,
+		rows)
+
+def apply_skin_weights(mesh, weights, skin_cluster=None):
+	"""
+	Writes a whole weight table into the mesh's skin cluster with a single
+	bulk set, normalizing once at the end. Undoes in one step.
+	"""
+	with SkinWeightSetter(mesh, skin_cluster) as setter:
+		if len(weights) != setter.count:
+			raise ValueError('%s has %d vertices, but the weights are for %d.' \
+				% (mesh, setter.count, len(weights)))
+		setter.check(weights.influences)
+		names = weights.influences
+		setter.set([(i, [(names[ii], w) for ii, w in row]) \
+			for i, pos, row in weights])
+
+def apply_skin_weight_batches(mesh, batches, skin_cluster=None):
+	"""
+	Writes (vertex index, [(influence, weight), ...]) batches, such as those
+	iter_xml yields, into the mesh's skin cluster with one bulk set per batch,
+	normalizing once at the end. Undoes in one step.
+	"""
+	with SkinWeightSetter(mesh, skin_cluster) as setter:
+		for batch in batches:
+			setter.set(batch)
+
+def iter_xml(path, batch_size=BATCH_SIZE):
+	"""
+	Incrementally parses a weight file written by write_xml, yielding lists of
+	up to batch_size (vertex index, [(influence, weight), ...]) tuples, where
+	influence is a name. Vertex elements are freed as soon as they are read, so
+	memory depends on the batch size rather than the file size.
+	"""
+
+	influences, vertices, batch, index = {}, None, [], 0
+	for event, elem in iterparse(path, events=('start', 'end')):
+		if event == 'start':
+			if elem.tag == 'Vertices':
+				vertices = elem
+			continue
+		if elem.tag == 'Influence':
+			influences[int(elem.attrib['index'])] = elem.attrib['name']
+		elif elem.tag == 'Vertex':
+			batch.append((index, [(influences[int(w.attrib['influence'])],
+				float(w.attrib['value'])) for w in elem.findall('Weight')]))
+			index += 1
+			vertices.clear()
+			if len(batch) == batch_size:
+				yield batch
+				batch = []
+	if batch:
+		yield batch
+
+def read_xml(path):
+	"""
+	Reads a weight file written by write_xml.
+	"""
+	doc = ElementTree(file=path)
+	influences = [inf.attrib['name'] for inf in doc.findall('.//Influence')]
+	positions, rows = array('d'), []
+	for vtx in doc.findall('.//Vertex'):
+		positions.extend(parse_position(vtx.attrib['pos']))
+		rows.append([(int(w.attrib['influence']), float(w.attrib['value'])) \
+			for w in vtx.findall('Weight')])
+	return SkinWeights.from_rows(doc.getroot().attrib['name'], influences,
+		positions, rows)
+
+def write_xml(weights, f, indent='\t'):
+	"""
+	Streams the weight table to an open file as XML, one element at a time,
+	with the same layout and indentation minidom's toprettyxml gives an
+	ElementTree of <Mesh>/<Influences>/<Vertices>. Nothing but the current
+	vertex is ever held in memory.
+	"""
+
+	f.write('<?xml version="1.0" ?>\n')
+	f.write('<Mesh name=%s>\n' % _quote(weights.name))
+
+	f.write('%s<Influences>\n' % indent)
+	for i, inf in enumerate(weights.influences):
+		f.write('%s<Influence index="%d" name=%s/>\n' % (indent * 2, i,
+			_quote(inf)))
+	f.write('%s</Influences>\n' % indent)
+
+	f.write('%s<Vertices>\n' % indent)
+	for i, pos, row in weights:
+		vertex = '%s<Vertex pos="%s"' % (indent * 2, format_position(pos))
+		if not row:
+			f.write(vertex + '/>\n')
+			continue
+		f.write(vertex + '>\n')
+		f.write(''.join(['%s<Weight influence="%d" value="%s"/>\n' % \
+			(indent * 3, ii, w) for ii, w in row]))
+		f.write('%s</Vertex>\n' % (indent * 2))
+	f.write('%s</Vertices>\n' % indent)
+
+	f.write('</Mesh>\n')
+
+def write_binary(weights, f):
+	"""
+	Writes the weight table to a file opened in binary mode in the compact
+	CSR layout described at the top of this module.
+	"""
+
+	f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0,
+		len(weights), len(weights.influences), len(weights.values)))
+	names = b''
+	for name in [weights.name] + weights.influences:
+		name = str(name).encode('utf-8')
+		names += BINARY_NAME.pack(len(name)) + name
+	f.write(names + b'\0' * (-(BINARY_HEADER.size + len(names)) % 4))
+	for typecode, values in (('f', weights.positions), ('I', weights.offsets),
+		('f', weights.values), ('H', weights.columns)):
+		write_array(f, typecode, values)
+
+def read_binary(path):
+	"""
+	Memory-maps a binary weight file and returns its table. The positions,
+	offsets, values and columns are views straight into the mapped file
+	(numpy arrays when numpy is installed, typed memoryviews otherwise); only
+	where neither is available are they copied into arrays.
+	"""
+
+	with open(path, 'rb') as f:
+		buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+	magic, version, flags, count, inf_count, nnz = \
+		BINARY_HEADER.unpack_from(buf, 0)
+	if magic != BINARY_MAGIC or version > BINARY_VERSION:
+		raise ValueError('Not a skin weight file: %s.' % path)
+	offset = BINARY_HEADER.size
+	names = []
+	for i in range(inf_count + 1):
+		size = BINARY_NAME.unpack_from(buf, offset)[0]
+		offset += BINARY_NAME.size
+		names.append(buf[offset:offset + size].decode('utf-8'))
+		offset += size
+	offset += -offset % 4
+	sections = []
+	for typecode, length in (('f', count * 3), ('I', count + 1),
+		('f', nnz), ('H', nnz)):
+		sections.append(view(buf, offset, typecode, length))
+		offset += length * struct.calcsize('<' + typecode)
+	positions, offsets, values, columns = sections
+	return SkinWeights(names[0], names[1:], positions, offsets, columns,
+		values)
+
+def save_skin_weights(weights, path):
+	"""
+	Writes the weight table as XML or binary, depending on the extension.
+	"""
+	if os.path.splitext(path)[1] == BINARY_EXT:
+		with open(path, 'wb') as f:
+			write_binary(weights, f)
+	else:
+		with open(path, 'w') as f:
+			write_xml(weights, f)
+
+def load_skin_weights(path):
+	"""
+	Reads an XML or binary weight file, depending on the extension.
+	"""
+	if os.path.splitext(path)[1] == BINARY_EXT:
+		return read_binary(path)
+	return read_xml(path)
+
+def format_position(position):
+	"""
+	Formats a position the same way PyMEL prints a Point.
+	"""
+	return '[%s]' % ', '.join(str(x) for x in position)
+
+def parse_position(text):
+	"""
+	Reads a position back from format_position's text.
+	"""
+	return [float(x) for x in text.strip('[]').split(',')]
+
+def _quote(value):
+	return '"%s"' % escape(str(value), {'"': '&quot;'})
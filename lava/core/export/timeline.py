@@ -0,0 +1,109 @@
+#=================================================
+# external imports
+#=================================================
+
+from maya import OpenMaya as om
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.core.export.nodes import read_points
+from lava.core.export.pointcache import PointCacheWriter
+
+#=================================================
+# classes
+#=================================================
+
+class Stream(object):
+	"""
+	Something a TimelineSampler feeds every frame: begin() is called before
+	the first frame, sample() with each frame and end() after the last (or
+	after an abort). A stream that can only read the scene at its current
+	time, such as Maya's own exporters, sets current_time. The stage names
+	what its sampling is timed as, if the sampler is given a timer.
+	"""
+
+	current_time = False
+	stage = None
+
+	def begin(self):
+		pass
+
+	def sample(self, frame, renum_frame, time):
+		"""
+		Reads and writes one frame: time is the frame to evaluate at in a DG
+		context, or None to read the current time. Returning False aborts
+		the run.
+		"""
+
+	def end(self):
+		pass
+
+class TimelineSampler(object):
+	"""
+	Walks a frame range once and hands every frame to all of its streams,
+	so the scene is evaluated once per frame however many kinds of data get
+	exported from it.
+	"""
+
+	def __init__(self, frames):
+		self.frames = list(frames)
+		self.streams = []
+
+	def add(self, stream):
+		self.streams.append(stream)
+		return stream
+
+	def run(self, go_to, aborted=None, sampled=None, timer=None):
+		"""
+		Samples every frame, returning False if a stream or aborted() stopped
+		the run. go_to(frame, current_time) gets the scene ready to sample a
+		frame and returns the time to evaluate at; sampled(frame) is called
+		after each frame. A StageTimer times each stream that names a stage.
+		"""
+		current_time = True in [s.current_time for s in self.streams]
+		for stream in self.streams:
+			stream.begin()
+		try:
+			for frame, renum_frame in self.frames:
+				if aborted and aborted():
+					return False
+				time = go_to(frame, current_time)
+				for stream in self.streams:
+					if timer is not None and stream.stage:
+						with timer.stage(stream.stage):
+							result = stream.sample(frame, renum_frame, time)
+					else:
+						result = stream.sample(frame, renum_frame, time)
+					if result is False:
+						return False
+				if sampled:
+					sampled(frame)
+			return True
+		finally:
+			for stream in self.streams:
+				stream.end()
+
+class PointCacheStream(Stream):
+	"""
+	Appends each frame's world-space points of a set of meshes to their
+	point caches.
+	"""
+
+	stage = 'point cache'
+
+	def __init__(self):
+		self.writers = []
+
+	def add(self, shape_path, path, name, vertex_count, frames, sample_rate):
+		self.writers.append((shape_path,
+			PointCacheWriter(path, name, vertex_count, frames, sample_rate)))
+
+	def sample(self, frame, renum_frame, time):
+		for shape_path, writer in self.writers:
+			writer.write(read_points(shape_path, om.MSpace.kWorld, time))
+
+	def end(self):
+		for shape_path, writer in self.writers:
+			writer.close()
@@ -0,0 +1,96 @@
+import sys
+import time
+
+from pymel.core.windows import getMainProgressBar
+
+
+class ProgressReporter(object):
+	"""
+	Drives a docker's progress bar and status label, along with Maya's main
+	progress bar, no more than rate times a second however often it's
+	stepped, and asks Maya whether Esc was pressed no more often than that.
+	On a fast loop, updating the UI every pass can cost more than the work
+	itself. Either widget can be left out.
+	"""
+	
+	def __init__(self, progress=None, status=None, main_progress=None,
+		interruptable=True, rate=10, clock=time.time):
+		self.progress, self.status_label = progress, status
+		self.main_progress = main_progress or getMainProgressBar()
+		self.interruptable = interruptable
+		self.interval, self.clock = 1.0 / rate, clock
+		self.total = self.value = self.shown = 0
+		self.text = self.shown_text = None
+		self.updated = self.checked = None
+		self.is_cancelled = False
+	
+	def begin(self, total, text=None):
+		self.total, self.value, self.shown = total, 0, 0
+		self.is_cancelled, self.checked = False, None
+		
+		# Start the main progress bar.
+		main_progress = self.main_progress
+		main_progress.setIsInterruptable(self.interruptable)
+		main_progress.setMaxValue(sys.maxsize)
+		main_progress.setMinValue(-sys.maxsize)
+		main_progress.setMaxValue(total)
+		main_progress.setMinValue(0)
+		main_progress.beginProgress()
+		
+		# Start the local progress bar.
+		if self.progress is not None:
+			self.progress.setRange(0, total)
+			self.progress.setValue(0)
+		if text is not None:
+			self.status(text)
+		self.flush()
+	
+	def step(self, count=1):
+		self.value += count
+		self.update()
+	
+	def status(self, text):
+		self.text = text
+		self.update()
+	
+	def update(self):
+		"""
+		Shows the latest progress and status if the last update was long
+		enough ago.
+		"""
+		now = self.clock()
+		if self.updated is None or now - self.updated >= self.interval:
+			self.flush(now)
+	
+	def flush(self, now=None):
+		"""
+		Shows the latest progress and status now.
+		"""
+		if now is None:
+			now = self.clock()
+		self.updated = now
+		if self.value != self.shown:
+			self.main_progress.step(self.value - self.shown)
+			if self.progress is not None:
+				self.progress.setValue(min(self.value, self.total))
+			self.shown = self.value
+		if self.text != self.shown_text and self.status_label is not None:
+			self.status_label.setText(self.text)
+			self.shown_text = self.text
+	
+	def end(self):
+		self.flush()
+		self.main_progress.endProgress()
+	
+	def cancelled(self):
+		"""
+		Returns whether Esc was pressed, asking Maya at most rate times a
+		second. Once cancelled, it stays cancelled until the next begin().
+		"""
+		if self.is_cancelled or not self.interruptable:
+			return self.is_cancelled
+		now = self.clock()
+		if self.checked is None or now - self.checked >= self.interval:
+			self.checked = now
+			self.is_cancelled = bool(self.main_progress.getIsCancelled())
+		return self.is_cancelled
@@ -0,0 +1,52 @@
+#=================================================
+# external imports
+#=================================================
+
+import struct
+import sys
+from array import array
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+#=================================================
+# functions
+#=================================================
+
+def view(buf, offset, typecode, count):
+	"""
+	Returns count little-endian items of an array typecode, starting at
+	offset, without copying them out of the buffer (e.g. a mmap or a ctypes
+	array) when possible: as a numpy array when numpy is installed, as a
+	typed memoryview otherwise. Only Python 2 without numpy falls back to an
+	array copy.
+	"""
+	size = count * struct.calcsize('<' + typecode)
+	if numpy is not None:
+		return numpy.frombuffer(buf, numpy.dtype('<' + typecode), count, offset)
+	try:
+		if sys.byteorder == 'little':
+			data = memoryview(buf).cast('B')
+			return data[offset:offset + size].cast(typecode)
+	except (NameError, AttributeError):
+		pass  # Python 2.6 has no memoryview, 2.7 cannot cast one.
+	values = array(typecode)
+	values.fromstring(buf[offset:offset + size])
+	if sys.byteorder != 'little':
+		values.byteswap()
+	return values
+
+def write_array(f, typecode, values):
+	"""
+	Writes a sequence to an open binary file as little-endian items of an
+	array typecode. Numpy arrays are converted without a Python object per
+	item.
+	"""
+	if numpy is not None and isinstance(values, numpy.ndarray):
+		f.write(values.astype('<' + typecode).tobytes())
+		return
+	values = array(typecode, values)
+	if sys.byteorder != 'little':
+		values.byteswap()
+	values.tofile(f)
@@ -0,0 +1,76 @@
+#=================================================
+# external imports
+#=================================================
+
+import gzip
+try:
+	from compression import zstd
+except ImportError:
+	zstd = None
+
+#=================================================
+# constants
+#=================================================
+
+# Zstandard is much faster than gzip at similar ratios, but only ships with
+# Python 3.14 and later.
+CODECS = zstd and ('gzip', 'zstd') or ('gzip',)
+EXTENSIONS = dict(gzip='.gz', zstd='.zst')
+LEVELS = dict(gzip=(1, 9), zstd=(1, 22))
+DEFAULT_LEVELS = dict(gzip=6, zstd=3)
+
+#=================================================
+# classes
+#=================================================
+
+class CompressedWriter(object):
+	"""
+	A binary file that compresses what's written to it as it goes, with
+	one of CODECS, and counts the bytes before compression. Text is written
+	as utf-8.
+	"""
+
+	def __init__(self, path, codec='gzip', level=None):
+		if codec not in CODECS:
+			raise ValueError('Unsupported compression: %s. Use one of: %s.' % \
+				(codec, ', '.join(CODECS)))
+		if level is None:
+			level = DEFAULT_LEVELS[codec]
+		if codec == 'zstd':
+			self.f = zstd.open(path, 'wb', level=level)
+		else:
+			self.f = gzip.GzipFile(path, 'wb', level)
+		self.size = 0
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def write(self, data):
+		if not isinstance(data, bytes):
+			data = data.encode('utf-8')
+		self.size += len(data)
+		self.f.write(data)
+
+	def close(self):
+		self.f.close()
+
+#=================================================
+# functions
+#=================================================
+
+def open_compressed(path):
+	"""
+	Opens a file for reading, decompressing it as it's read if its
+	extension names one of CODECS.
+	"""
+	path = str(path)
+	if path.endswith(EXTENSIONS['gzip']):
+		return gzip.GzipFile(path, 'rb')
+	if path.endswith(EXTENSIONS['zstd']):
+		if zstd is None:
+			raise ValueError('This Python cannot read zstd files: %s.' % path)
+		return zstd.open(path, 'rb')
+	return open(path, 'rb')
@@ -0,0 +1,95 @@
+#=================================================
+# external imports
+#=================================================
+
+from heapq import heappush
+from heapq import heapreplace
+
+#=================================================
+# classes
+#=================================================
+
+class KDTree(object):
+	"""
+	A static 3D k-d tree over a flat x, y, z sequence of points, built in
+	O(n log n) and queried for the k nearest points in O(log n) on average.
+	Leaves hold small buckets of points, which keeps the Python overhead of
+	both building and searching down.
+	"""
+
+	def __init__(self, points, leaf_size=8):
+		self.points = [tuple(points[i:i + 3]) for i in range(0, len(points), 3)]
+		self.leaf_size = leaf_size
+
+		# Nodes are (axis, split, left, right) for branches and
+		# (None, indices) for leaves, all stored in one flat list.
+		self.nodes = []
+		self.root = self._build(list(range(len(self.points))))
+
+	def __len__(self):
+		return len(self.points)
+
+	def _build(self, indices):
+		node = len(self.nodes)
+		if len(indices) <= self.leaf_size:
+			self.nodes.append((None, indices))
+			return node
+
+		# Split on the widest axis at the median point.
+		points = self.points
+		spans = []
+		for axis in range(3):
+			values = [points[i][axis] for i in indices]
+			spans.append(max(values) - min(values))
+		axis = spans.index(max(spans))
+		indices.sort(key=lambda i: points[i][axis])
+		mid = len(indices) // 2
+		self.nodes.append(None)
+		left = self._build(indices[:mid])
+		right = self._build(indices[mid:])
+		self.nodes[node] = (axis, points[indices[mid]][axis], left, right)
+		return node
+
+	def query(self, point, k=1):
+		"""
+		Returns up to k (squared distance, index) pairs, nearest first.
+		"""
+
+		if not self.points:
+			return []
+		x, y, z = point
+		points, nodes = self.points, self.nodes
+		best = []  # Max-heap of the k nearest, by negated distance.
+		stack = [(self.root, 0.0)]
+		while stack:
+			node, bound = stack.pop()
+			if len(best) == k and bound >= -best[0][0]:
+				continue
+			node = nodes[node]
+			if node[0] is None:
+				for i in node[1]:
+					p = points[i]
+					dx, dy, dz = p[0] - x, p[1] - y, p[2] - z
+					d = dx * dx + dy * dy + dz * dz
+					if len(best) < k:
+						heappush(best, (-d, i))
+					elif d < -best[0][0]:
+						heapreplace(best, (-d, i))
+				continue
+
+			# Visit the near side first; the far side only matters if the
+			# splitting plane is closer than the current kth nearest.
+			axis, split, left, right = node
+			delta = point[axis] - split
+			near, far = delta < 0 and (left, right) or (right, left)
+			delta *= delta
+			if len(best) < k or delta < -best[0][0]:
+				stack.append((far, delta))
+			stack.append((near, bound))
+		return sorted((-d, i) for d, i in best)
+
+	def nearest(self, point):
+		"""
+		Returns the index of the nearest point.
+		"""
+		return self.query(point, 1)[0][1]
@@ -0,0 +1,169 @@
+#=================================================
+# external imports
+#=================================================
+
+import ctypes
+from array import array
+
+from maya import OpenMaya as om
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+#=================================================
+# internal imports
+#=================================================
+
+from lava.util.buffers import view
+
+#=================================================
+# constants
+#=================================================
+
+# Views onto raw memory need numpy or a memoryview that can be cast (Python
+# 3); anything older reads through the API's arrays instead.
+try:
+	ZERO_COPY = numpy is not None or hasattr(memoryview, 'cast')
+except NameError:
+	ZERO_COPY = False
+
+#=================================================
+# classes
+#=================================================
+
+class PointBuffer(object):
+	"""
+	A mesh's points, normals and UVs as flat, contiguous float32 arrays, one
+	API call each instead of a Python object per vertex. Object-space points
+	and normals are views straight onto Maya's own storage, through
+	getRawPoints/getRawNormals and ctypes, so reading them copies nothing.
+	Such a view is only valid until the mesh changes: ask for a copy to
+	keep the values past that.
+
+	The mesh is an MDagPath or mesh data, such as a plug evaluated in a DG
+	context. Mesh data has no world space of its own; worldMesh data is
+	already in world space.
+	"""
+
+	def __init__(self, mesh):
+		self.mesh = mesh  # Keeps evaluated mesh data alive with the views.
+		self.fn = om.MFnMesh(mesh)
+		self.path = isinstance(mesh, om.MDagPath) and mesh or None
+
+	def __len__(self):
+		return self.fn.numVertices()
+
+	def _raw(self, method, count):
+		"""
+		Returns a zero-copy float32 view of count floats at the pointer a raw
+		accessor returns, or None where that can't be done.
+		"""
+		get = getattr(self.fn, method, None)
+		if not ZERO_COPY or get is None or not count:
+			return None
+		try:
+			address = int(get())
+		except (TypeError, ValueError, RuntimeError):
+			return None
+		if not address:
+			return None
+		data = (ctypes.c_ubyte * (count * 4)).from_address(address)
+		data.owner = self  # Keeps the function set, and so the mesh, alive.
+		return view(data, 0, 'f', count)
+
+	def _matrix(self, inverse_transpose=False):
+		m = self.path.inclusiveMatrix()
+		m = numpy.array([[m(i, j) for j in range(4)] for i in range(4)])
+		if inverse_transpose:
+			return numpy.linalg.inv(m[:3, :3]).T, None
+		return m[:3, :3], m[3, :3]
+
+	def points(self, space=om.MSpace.kObject, copy=False):
+		"""
+		Returns every vertex position as a flat x, y, z float32 array, of its
+		own if copy is set, otherwise possibly a view onto the mesh.
+		"""
+		world = space == om.MSpace.kWorld and self.path is not None
+		raw = None
+		if not world or numpy is not None:
+			raw = self._raw('getRawPoints', len(self) * 3)
+		if raw is not None and not world:
+			if copy:
+				return copied(raw)
+			return raw
+		if raw is not None:
+
+			# Maya's matrices multiply row vectors: p' = p * M.
+			rotation, translation = self._matrix()
+			points = numpy.asarray(raw, numpy.float64).reshape(-1, 3)
+			return (points.dot(rotation) + translation).astype(
+				numpy.float32).ravel()
+		points = om.MPointArray()
+		self.fn.getPoints(points, world and space or om.MSpace.kObject)
+		result = array('f')
+		for i in range(points.length()):
+			p = points[i]
+			result.extend((p.x, p.y, p.z))
+		return result
+
+	def normals(self, space=om.MSpace.kObject, copy=False):
+		"""
+		Returns every normal, indexed by normal id, as a flat x, y, z float32
+		array, of its own if copy is set.
+		"""
+		world = space == om.MSpace.kWorld and self.path is not None
+		raw = None
+		if not world or numpy is not None:
+			raw = self._raw('getRawNormals', self.fn.numNormals() * 3)
+		if raw is not None and not world:
+			if copy:
+				return copied(raw)
+			return raw
+		if raw is not None:
+
+			# Normals take the inverse transpose, then get renormalized.
+			matrix = self._matrix(True)[0]
+			normals = numpy.asarray(raw, numpy.float64).reshape(-1, 3)
+			normals = normals.dot(matrix)
+			lengths = numpy.sqrt((normals * normals).sum(axis=1))
+			lengths[lengths == 0] = 1
+			return (normals / lengths[:, None]).astype(
+				numpy.float32).ravel()
+		normals = om.MFloatVectorArray()
+		self.fn.getNormals(normals, world and space or om.MSpace.kObject)
+		result = array('f')
+		for i in range(normals.length()):
+			n = normals[i]
+			result.extend((n.x, n.y, n.z))
+		return result
+
+	def uvs(self, uv_set=None):
+		"""
+		Returns every UV of a UV set (the current one by default) as a flat
+		u, v float32 array.
+		"""
+		u, v = om.MFloatArray(), om.MFloatArray()
+		if uv_set:
+			self.fn.getUVs(u, v, uv_set)
+		else:
+			self.fn.getUVs(u, v)
+		result = array('f', [0.0]) * (2 * u.length())
+		for i in range(u.length()):
+			result[2 * i] = u[i]
+			result[2 * i + 1] = v[i]
+		return result
+
+#=================================================
+# functions
+#=================================================
+
+def copied(values):
+	"""
+	Returns a float32 view's values in an array of their own.
+	"""
+	if numpy is not None and isinstance(values, numpy.ndarray):
+		return values.copy()
+	result = array('f')
+	result.frombytes(values.tobytes())
+	return result
@@ -0,0 +1,114 @@
+#=================================================
+# external imports
+#=================================================
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+#=================================================
+# constants
+#=================================================
+
+EXT = '.timings.json'
+PERCENTILES = (50, 90, 99)
+
+# The most precise clock available: perf_counter only exists in Python 3.
+CLOCK = getattr(time, 'perf_counter', time.time)
+
+#=================================================
+# classes
+#=================================================
+
+class StageTimer(object):
+	"""
+	Accumulates how long each stage of a loop takes, one sample per pass, for
+	per-stage totals and percentiles at the end. Stages are timed with
+	"with timer.stage(name):" or added with add(name, seconds). A stage
+	nested in another counts toward both, and stages timed on other threads
+	overlap the loop's own, so the totals can add up to more than the time
+	elapsed. Stages can be timed from any thread.
+	"""
+
+	def __init__(self, clock=CLOCK):
+		self.clock = clock
+		self.samples, self.names = {}, []
+		self.lock = threading.Lock()
+		self.started = clock()
+
+	@contextmanager
+	def stage(self, name):
+		start = self.clock()
+		try:
+			yield
+		finally:
+			self.add(name, self.clock() - start)
+
+	def add(self, name, seconds):
+		with self.lock:
+			samples = self.samples.get(name)
+			if samples is None:
+				samples = self.samples[name] = []
+				self.names.append(name)
+			samples.append(seconds)
+
+	def elapsed(self):
+		return self.clock() - self.started
+
+	def stats(self):
+		"""
+		Returns each stage's sample count, total, mean, percentiles and
+		maximum, in seconds, slowest stage first.
+		"""
+		with self.lock:
+			names = list(self.names)
+			copies = dict((n, list(self.samples[n])) for n in names)
+		result = []
+		for name in names:
+			samples = sorted(copies[name])
+			total = sum(samples)
+			stats = dict(name=name, count=len(samples), total=total,
+				mean=total / len(samples), max=samples[-1])
+			for p in PERCENTILES:
+				stats['p%d' % p] = percentile(samples, p)
+			result.append(stats)
+		result.sort(key=lambda s: -s['total'])
+		return result
+
+	def report(self):
+		return dict(elapsed=self.elapsed(), stages=self.stats())
+
+	def summary(self, count=3):
+		"""
+		Returns a line naming the slowest stages, with their totals and share
+		of the time elapsed.
+		"""
+		elapsed = self.elapsed()
+		stages = ['%s %.2fs (%d%%)' % (s['name'], s['total'],
+			elapsed and 100 * s['total'] / elapsed or 0) \
+			for s in self.stats()[:count]]
+		if not stages:
+			return 'Nothing was timed.'
+		return 'Took %.2fs. Slowest: %s.' % (elapsed, ', '.join(stages))
+
+	def save(self, path):
+		"""
+		Writes the report to a JSON file.
+		"""
+		with open(path, 'w') as f:
+			json.dump(self.report(), f, indent=1, sort_keys=True)
+
+#=================================================
+# functions
+#=================================================
+
+def percentile(samples, p):
+	"""
+	Returns the nearest-rank percentile of sorted samples.
+	"""
+	if not samples:
+		return None
+	rank = int(math.ceil(p / 100.0 * len(samples))) - 1
+	return samples[min(len(samples) - 1, max(0, rank))]
@@ -0,0 +1,89 @@
+#=================================================
+# external imports
+#=================================================
+
+import sys
+import threading
+try:
+	from queue import Queue
+except ImportError:
+	from Queue import Queue
+
+#=================================================
+# classes
+#=================================================
+
+class WriteQueue(object):
+	"""
+	Runs write jobs on a pool of threads, behind whatever produces them, so
+	producing the next job overlaps with writing the last ones. The queue is
+	bounded: put() blocks while it's full, which keeps a fast producer from
+	piling up payloads in memory. The first job to fail stops the others
+	from starting, and its exception is raised again, in the producer's
+	thread, from the next put(), join() or close().
+	"""
+
+	def __init__(self, threads=2, size=8):
+		self.queue = Queue(size)
+		self.error, self.failed = None, False
+		self.threads = []
+		for i in range(max(1, threads)):
+			thread = threading.Thread(target=self._work)
+			thread.daemon = True
+			thread.start()
+			self.threads.append(thread)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def _work(self):
+		while True:
+			item = self.queue.get()
+			try:
+				if item is None:
+					return
+				if not self.failed:
+					job, args = item
+					job(*args)
+			except:
+				if not self.failed:
+					self.failed, self.error = True, sys.exc_info()[1]
+			finally:
+				self.queue.task_done()
+
+	def check(self):
+		"""
+		Raises the exception of the first job that failed, if any.
+		"""
+		if self.error is not None:
+			error, self.error = self.error, None
+			raise error
+
+	def put(self, job, *args):
+		"""
+		Queues job(*args), blocking while the queue is full.
+		"""
+		self.check()
+		self.queue.put((job, args))
+
+	def join(self):
+		"""
+		Waits for every queued job to finish.
+		"""
+		self.queue.join()
+		self.check()
+
+	def close(self):
+		"""
+		Waits for every queued job to finish and stops the threads.
+		"""
+		if self.threads:
+			for thread in self.threads:
+				self.queue.put(None)
+			for thread in self.threads:
+				thread.join()
+			self.threads = []
+		self.check()